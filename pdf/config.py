@@ -1,3 +1,6 @@
+import tempfile
+from pathlib import Path
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,6 +12,40 @@ class PdfSettings(BaseSettings):
     s3_access_key_id: str = ""
     s3_secret_access_key: str = ""
     s3_prefix: str = "pdf/"
+    s3_endpoint_url: str = ""
+    s3_multipart_threshold: int = 16 * 1024 * 1024
+    s3_multipart_chunk_size: int = 8 * 1024 * 1024
+    s3_max_concurrency: int = 8
+
+    # Extraction engine (0 = os.cpu_count())
+    extract_workers: int = 0
+    extract_pages_per_task: int = 32
+    extract_parallel_min_pages: int = 64
+    batch_concurrency: int = 4
+    compress_min_bytes: int = 1024
+
+    # Admission control: concurrent extraction slots and waiting-queue depth before 429
+    admission_slots: int = 4
+    admission_max_queue: int = 16
+    admission_retry_after_seconds: int = 5
+
+    # Uploads are spooled to disk in fixed-size chunks (empty spool_dir = system temp dir)
+    spool_dir: str = ""
+    upload_chunk_size: int = 1024 * 1024
+    upload_max_bytes: int = 200 * 1024 * 1024
+    # Content-Length guard applied before the multipart body is parsed/buffered
+    # (0 = upload_max_bytes + multipart overhead; batch requests count all files together)
+    max_request_bytes: int = 0
+    multipart_overhead_bytes: int = 1024 * 1024
+
+    # Extraction cache (keyed by content hash; empty cache_dir disables the disk tier)
+    cache_enabled: bool = True
+    cache_memory_max_chars: int = 64_000_000
+    cache_dir: str = str(Path(tempfile.gettempdir()) / "pdf-extract-cache")
+    cache_disk_max_bytes: int = 2 * 1024**3
+
+    def request_limit_bytes(self) -> int:
+        return self.max_request_bytes or self.upload_max_bytes + self.multipart_overhead_bytes
 
 
 settings = PdfSettings()
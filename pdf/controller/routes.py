@@ -1,43 +1,250 @@
-from fastapi import APIRouter, HTTPException, UploadFile, status
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response, UploadFile, status
 from fastapi.params import File
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
-from pdf.domain.schemas import PdfExtractResponse, PdfIngestResponse
-from pdf.service.pdf_service import extract_pdf_text_from_bytes, upload_pdf_to_s3
+from pdf.config import settings
+from pdf.domain.schemas import (
+    PdfBatchExtractResponse,
+    PdfBatchItem,
+    PdfExtractResponse,
+    PdfIngestResponse,
+    PdfPageChunk,
+)
+from pdf.service.pdf_service import (
+    extract_pdf_pages_async,
+    extract_pdf_range_async,
+    extraction_pool_pids,
+    get_admission_controller,
+    get_extraction_cache,
+    iter_pdf_pages_async,
+    join_pages_with_offsets,
+    upload_pdf_to_s3,
+)
+from pdf.service.admission import AdmissionController, AdmissionRejectedError
+from pdf.service.page_codec import PAGES_MEDIA_TYPE, compress, encode_batch, encode_document, wants_pages_format
+from pdf.service.process_stats import pool_memory_mb, process_memory_mb
+from pdf.service.upload_spool import SpooledUpload, UploadTooLargeError, spool_upload
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 @router.post("/pdf/extract", response_model=PdfExtractResponse)
-async def extract_pdf(file: UploadFile = File(...)) -> PdfExtractResponse:
-    if not file.filename:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing filename.")
-    if not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only PDF files are allowed.")
-    if file.content_type and file.content_type != "application/pdf":
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid content type.")
-    content = await file.read()
-    text, page_count = extract_pdf_text_from_bytes(content)
+async def extract_pdf(
+    file: UploadFile = File(...),
+    start_page: int = Query(1, ge=1),
+    end_page: int | None = Query(None, ge=1),
+    accept: str | None = Header(None),
+    accept_encoding: str | None = Header(None),
+) -> PdfExtractResponse | Response:
+    _validate_pdf_upload(file)
+    _validate_page_range(start_page, end_page)
+    async with _admitted():
+        spooled = await _spool_or_reject(file)
+        try:
+            pages, page_count = await extract_pdf_range_async(spooled.path, spooled.sha256, start_page, end_page)
+        finally:
+            spooled.cleanup()
+    if page_count and start_page > page_count:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"start_page exceeds page count ({page_count})."
+        )
+    if wants_pages_format(accept):
+        return await _pages_response(encode_document(pages, page_count, start_page), accept_encoding)
+    text, page_offsets = join_pages_with_offsets(pages)
     return PdfExtractResponse(
         file_name=file.filename,
         page_count=page_count,
         text=text,
+        start_page=start_page,
+        end_page=start_page + len(pages) - 1,
+        page_offsets=page_offsets,
     )
 
 
+@router.post("/pdf/extract/stream")
+async def extract_pdf_stream(
+    file: UploadFile = File(...),
+    start_page: int = Query(1, ge=1),
+    end_page: int | None = Query(None, ge=1),
+) -> StreamingResponse:
+    _validate_pdf_upload(file)
+    _validate_page_range(start_page, end_page)
+    admission = _admit_or_reject()
+    await admission.acquire(fail_fast=False)
+    try:
+        spooled = await _spool_or_reject(file)
+    except BaseException:
+        admission.release()
+        raise
+    finished = False
+
+    def finish() -> None:
+        # 스트림 종료(정상/중단) 시 슬롯 반환과 임시 파일 정리를 한 번만 수행
+        nonlocal finished
+        if not finished:
+            finished = True
+            spooled.cleanup()
+            admission.release()
+
+    async def ndjson_lines() -> AsyncIterator[str]:
+        # 페이지 1개당 JSON 1줄(NDJSON)
+        try:
+            async for page, text in iter_pdf_pages_async(spooled.path, spooled.sha256, start_page, end_page):
+                yield PdfPageChunk(page=page, text=text, char_count=len(text)).model_dump_json() + "\n"
+        finally:
+            finish()
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson", background=BackgroundTask(finish))
+
+
+@router.post("/pdf/extract/batch", response_model=PdfBatchExtractResponse)
+async def extract_pdf_batch(
+    files: List[UploadFile] = File(...),
+    accept: str | None = Header(None),
+    accept_encoding: str | None = Header(None),
+) -> PdfBatchExtractResponse | Response:
+    # 파일별 실패는 해당 항목의 error로만 기록하고 배치 전체는 계속 진행.
+    # 포화 상태면 배치 전체를 429로 거절하고, 일단 받은 배치의 파일들은 슬롯을 기다린다
+    admission = _admit_or_reject()
+    semaphore = asyncio.Semaphore(max(1, settings.batch_concurrency))
+
+    async def extract_one(file: UploadFile) -> tuple[str, str | None, List[str]]:
+        file_name = file.filename or ""
+        error = _pdf_upload_error(file)
+        if error:
+            return file_name, error, []
+        async with semaphore, admission.slot(fail_fast=False):
+            try:
+                spooled = await _spool_upload(file)
+            except UploadTooLargeError as exc:
+                return file_name, str(exc), []
+            except Exception:
+                # 상세(임시 경로 등)는 서버 로그에만 남기고 응답에는 일반 메시지
+                logger.exception("Batch upload spool failed file=%s", file_name)
+                return file_name, "Upload could not be read.", []
+            try:
+                pages = await extract_pdf_pages_async(spooled.path, spooled.sha256)
+            except Exception:
+                logger.exception("Batch extraction failed file=%s", file_name)
+                return file_name, "Extraction failed.", []
+            finally:
+                spooled.cleanup()
+        return file_name, None, pages
+
+    results = await asyncio.gather(*(extract_one(file) for file in files))
+    if wants_pages_format(accept):
+        return await _pages_response(encode_batch(results), accept_encoding)
+    items: List[PdfBatchItem] = []
+    for file_name, error, pages in results:
+        if error:
+            items.append(PdfBatchItem(file_name=file_name, error=error))
+            continue
+        text, page_offsets = join_pages_with_offsets(pages)
+        items.append(PdfBatchItem(file_name=file_name, page_count=len(pages), text=text, page_offsets=page_offsets))
+    return PdfBatchExtractResponse(items=items)
+
+
 @router.post("/pdf/ingest", response_model=PdfIngestResponse)
 async def ingest_pdf(file: UploadFile = File(...)) -> PdfIngestResponse:
-    if not file.filename:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing filename.")
-    if not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only PDF files are allowed.")
-    if file.content_type and file.content_type != "application/pdf":
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid content type.")
-    content = await file.read()
-    s3_key = upload_pdf_to_s3(file.filename, content)
-    text, page_count = extract_pdf_text_from_bytes(content)
+    _validate_pdf_upload(file)
+    async with _admitted():
+        spooled = await _spool_or_reject(file)
+        try:
+            # S3 업로드와 텍스트 추출을 동시에 진행
+            s3_key, pages = await asyncio.gather(
+                asyncio.to_thread(upload_pdf_to_s3, file.filename, spooled.path),
+                extract_pdf_pages_async(spooled.path, spooled.sha256),
+            )
+        finally:
+            spooled.cleanup()
+    text, page_offsets = join_pages_with_offsets(pages)
     return PdfIngestResponse(
         file_name=file.filename,
         s3_key=s3_key,
-        page_count=page_count,
+        page_count=len(pages),
         text=text,
+        page_offsets=page_offsets,
     )
+
+
+@router.get("/pdf/stats")
+async def pdf_stats() -> dict:
+    cache = get_extraction_cache()
+    return {
+        "cache": cache.stats() if cache else None,
+        "admission": get_admission_controller().stats(),
+        # API 프로세스와 살아 있는 추출 풀 워커의 RSS(/proc 기준, 비Linux면 None/0)
+        "process": process_memory_mb(),
+        "extraction_pool": pool_memory_mb(extraction_pool_pids()),
+    }
+
+
+async def _pages_response(body: bytes, accept_encoding: str | None) -> Response:
+    # Accept: application/x-pdf-pages 요청에 길이 접두 바이너리(+gzip/zstd)로 응답
+    body, encoding = await asyncio.to_thread(compress, body, accept_encoding, settings.compress_min_bytes)
+    headers = {"Content-Encoding": encoding} if encoding else None
+    return Response(content=body, media_type=PAGES_MEDIA_TYPE, headers=headers)
+
+
+def _admit_or_reject() -> AdmissionController:
+    admission = get_admission_controller()
+    try:
+        admission.check()
+    except AdmissionRejectedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+    return admission
+
+
+@asynccontextmanager
+async def _admitted() -> AsyncIterator[None]:
+    admission = _admit_or_reject()
+    async with admission.slot(fail_fast=False):
+        yield
+
+
+async def _spool_upload(file: UploadFile) -> SpooledUpload:
+    return await spool_upload(
+        file,
+        spool_dir=settings.spool_dir,
+        max_bytes=settings.upload_max_bytes,
+        chunk_size=settings.upload_chunk_size,
+    )
+
+
+async def _spool_or_reject(file: UploadFile) -> SpooledUpload:
+    try:
+        return await _spool_upload(file)
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)) from exc
+
+
+def _validate_page_range(start_page: int, end_page: int | None) -> None:
+    if end_page is not None and end_page < start_page:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_page must be >= start_page.")
+
+
+def _validate_pdf_upload(file: UploadFile) -> None:
+    error = _pdf_upload_error(file)
+    if error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+
+def _pdf_upload_error(file: UploadFile) -> str | None:
+    if not file.filename:
+        return "Missing filename."
+    if not file.filename.lower().endswith(".pdf"):
+        return "Only PDF files are allowed."
+    if file.content_type and file.content_type != "application/pdf":
+        return "Invalid content type."
+    return None
@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 
@@ -5,6 +7,9 @@ class PdfExtractResponse(BaseModel):
     file_name: str
     page_count: int
     text: str
+    start_page: int = 1
+    end_page: int = 0
+    page_offsets: List[int] = []
 
 
 class PdfIngestResponse(BaseModel):
@@ -12,3 +17,22 @@ class PdfIngestResponse(BaseModel):
     s3_key: str
     page_count: int
     text: str
+    page_offsets: List[int] = []
+
+
+class PdfPageChunk(BaseModel):
+    page: int
+    text: str
+    char_count: int
+
+
+class PdfBatchItem(BaseModel):
+    file_name: str
+    page_count: int = 0
+    text: str = ""
+    page_offsets: List[int] = []
+    error: Optional[str] = None
+
+
+class PdfBatchExtractResponse(BaseModel):
+    items: List[PdfBatchItem]
@@ -1,18 +1,45 @@
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
+
+from pdf.config import settings
 
 from pdf.controller.routes import router as pdf_router
+from pdf.service.pdf_service import shutdown_extraction_pool
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    shutdown_extraction_pool()
 
 
 def create_app() -> FastAPI:
     if not logging.getLogger().handlers:
         logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
-    app = FastAPI(title="pdf-service")
+    app = FastAPI(title="pdf-service", lifespan=lifespan)
+    app.middleware("http")(reject_oversized_requests)
     app.include_router(pdf_router)
     return app
 
 
+async def reject_oversized_requests(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    # 본문을 파싱하기 전에 Content-Length로 과도한 요청을 먼저 거절
+    limit = settings.request_limit_bytes()
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        return JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={"detail": f"Request exceeds {limit} bytes."},
+        )
+    return await call_next(request)
+
+
 def run() -> None:
     import uvicorn
 
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+
+class AdmissionRejectedError(RuntimeError):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Extraction service is saturated.")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    # 동시 추출 슬롯과 대기열 깊이를 제한하고, 대기열이 가득 차면 즉시 거절
+    def __init__(self, *, slots: int, max_queue: int, retry_after: int) -> None:
+        self.slots = max(1, slots)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(self.slots)
+        self._active = 0
+        self._waiting = 0
+        self._counters: Dict[str, int] = {"admitted": 0, "rejected": 0}
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._last_wait = 0.0
+
+    async def acquire(self, *, fail_fast: bool = True) -> None:
+        if fail_fast:
+            self.check()
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        waited = time.perf_counter() - started
+        self._active += 1
+        self._counters["admitted"] += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        self._last_wait = waited
+
+    def release(self) -> None:
+        self._active -= 1
+        self._semaphore.release()
+
+    def check(self) -> None:
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            self._counters["rejected"] += 1
+            raise AdmissionRejectedError(self.retry_after)
+
+    @asynccontextmanager
+    async def slot(self, *, fail_fast: bool = True) -> AsyncIterator[None]:
+        await self.acquire(fail_fast=fail_fast)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, int | float]:
+        admitted = self._counters["admitted"]
+        return {
+            "slots": self.slots,
+            "max_queue": self.max_queue,
+            "active": self._active,
+            "queue_depth": self._waiting,
+            **self._counters,
+            "wait_ms_avg": round(self._wait_total / admitted * 1000, 2) if admitted else 0.0,
+            "wait_ms_max": round(self._wait_max * 1000, 2),
+            "wait_ms_last": round(self._last_wait * 1000, 2),
+        }
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_key(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as fp:
+        for chunk in iter(lambda: fp.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    # PDF 원본 해시 -> 페이지별 텍스트 캐시 (메모리 LRU + 디스크 계층)
+    def __init__(self, *, memory_max_chars: int, disk_dir: str, disk_max_bytes: int) -> None:
+        self.memory_max_chars = memory_max_chars
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._memory: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._memory_chars = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(path.stat().st_size for path in self.disk_dir.glob("*.json"))
+
+    def get(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            pages = self._memory.get(key)
+            if pages is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return pages
+        pages = self._read_disk(key)
+        with self._lock:
+            if pages is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["disk_hits"] += 1
+            self._remember(key, pages)
+        return pages
+
+    def put(self, key: str, pages: List[str]) -> None:
+        with self._lock:
+            self._remember(key, pages)
+        self._write_disk(key, pages)
+
+    def stats(self) -> Dict[str, int | float]:
+        with self._lock:
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            lookups = hits + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "memory_chars": self._memory_chars,
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def _remember(self, key: str, pages: List[str]) -> None:
+        size = _pages_size(pages)
+        if size > self.memory_max_chars:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_chars -= _pages_size(previous)
+        self._memory[key] = pages
+        self._memory_chars += size
+        while self._memory_chars > self.memory_max_chars and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_chars -= _pages_size(evicted)
+
+    def _read_disk(self, key: str) -> Optional[List[str]]:
+        if self.disk_dir is None:
+            return None
+        path = self.disk_dir / f"{key}.json"
+        try:
+            pages = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.warning("Dropping unreadable extraction cache entry: %s", path)
+            path.unlink(missing_ok=True)
+            return None
+        return pages
+
+    def _write_disk(self, key: str, pages: List[str]) -> None:
+        if self.disk_dir is None:
+            return
+        path = self.disk_dir / f"{key}.json"
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(pages, ensure_ascii=False), encoding="utf-8")
+            existing = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+            size = path.stat().st_size
+        except OSError:
+            logger.exception("Failed to write extraction cache entry: %s", path)
+            tmp_path.unlink(missing_ok=True)
+            return
+        with self._lock:
+            self._disk_bytes += size - existing
+            over_budget = self._disk_bytes > self.disk_max_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        # 가장 오래 사용되지 않은(mtime 기준) 항목부터 용량 한도 아래로 내려갈 때까지 삭제
+        entries = []
+        for path in self.disk_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= self.disk_max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        with self._lock:
+            self._disk_bytes = total
+            self._counters["evictions"] += evicted
+
+
+def _pages_size(pages: List[str]) -> int:
+    return sum(len(page) for page in pages)
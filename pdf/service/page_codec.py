@@ -0,0 +1,76 @@
+import gzip
+import struct
+from typing import List, Optional, Sequence, Tuple
+
+# 페이지별 UTF-8 텍스트를 길이 접두(u32, big-endian)로 이어 붙인 바이너리 포맷.
+# 문서: b"PDFP" | version(u8) | page_count(u32) | start_page(u32) | n(u32) | (len(u32) | utf8)*n
+# 배치: b"PDFB" | version(u8) | items(u32) | (name | error | 문서)*items, name/error는 len(u32) | utf8
+PAGES_MEDIA_TYPE = "application/x-pdf-pages"
+DOCUMENT_MAGIC = b"PDFP"
+BATCH_MAGIC = b"PDFB"
+FORMAT_VERSION = 1
+
+_U32 = struct.Struct(">I")
+
+
+def wants_pages_format(accept: Optional[str]) -> bool:
+    return bool(accept) and PAGES_MEDIA_TYPE in accept
+
+
+def encode_document(pages: Sequence[str], page_count: int, start_page: int = 1) -> bytes:
+    parts = [DOCUMENT_MAGIC, bytes([FORMAT_VERSION]), _U32.pack(page_count), _U32.pack(start_page)]
+    parts.append(_U32.pack(len(pages)))
+    for page in pages:
+        parts.append(_encode_str(page))
+    return b"".join(parts)
+
+
+def encode_batch(items: Sequence[Tuple[str, Optional[str], Sequence[str]]]) -> bytes:
+    # items: (file_name, error, pages)
+    parts = [BATCH_MAGIC, bytes([FORMAT_VERSION]), _U32.pack(len(items))]
+    for file_name, error, pages in items:
+        parts.append(_encode_str(file_name))
+        parts.append(_encode_str(error or ""))
+        parts.append(encode_document(pages, len(pages)))
+    return b"".join(parts)
+
+
+def compress(body: bytes, accept_encoding: Optional[str], min_size: int) -> Tuple[bytes, Optional[str]]:
+    # 클라이언트가 허용한 경우에만 압축(zstd는 zstandard 패키지가 있을 때만)
+    if len(body) < min_size or not accept_encoding:
+        return body, None
+    encodings = {item.split(";")[0].strip().lower() for item in accept_encoding.split(",")}
+    if "zstd" in encodings:
+        try:
+            import zstandard
+        except ImportError:
+            pass
+        else:
+            return zstandard.ZstdCompressor(level=3).compress(body), "zstd"
+    if "gzip" in encodings:
+        return gzip.compress(body, compresslevel=5), "gzip"
+    return body, None
+
+
+def decode_document(buffer: bytes, offset: int = 0) -> Tuple[List[str], int, int, int]:
+    # (pages, page_count, start_page, 다음 오프셋)
+    if buffer[offset : offset + 4] != DOCUMENT_MAGIC:
+        raise ValueError("Invalid page payload.")
+    version = buffer[offset + 4] if offset + 4 < len(buffer) else None
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported page payload version: {version} (expected {FORMAT_VERSION}).")
+    offset += 5
+    page_count, start_page, total = struct.unpack_from(">III", buffer, offset)
+    offset += 12
+    pages: List[str] = []
+    for _ in range(total):
+        (length,) = _U32.unpack_from(buffer, offset)
+        offset += 4
+        pages.append(buffer[offset : offset + length].decode("utf-8"))
+        offset += length
+    return pages, page_count, start_page, offset
+
+
+def _encode_str(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return _U32.pack(len(data)) + data
@@ -1,10 +1,30 @@
+import asyncio
+import io
+import logging
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Tuple
+from typing import Any, AsyncIterator, List, Tuple, Union
 import uuid
 
 import fitz
 
 from pdf.config import settings
+from pdf.service.admission import AdmissionController
+from pdf.service.extraction_cache import ExtractionCache, content_key, file_key
+
+logger = logging.getLogger(__name__)
+
+# 업로드 원본: 메모리 bytes 또는 디스크에 스풀된 파일 경로
+PdfSource = Union[bytes, Path]
+
+_executor: ProcessPoolExecutor | None = None
+_cache: ExtractionCache | None = None
+_admission: AdmissionController | None = None
+_s3_client: Any | None = None
+_s3_lock = threading.Lock()
 
 
 def extract_pdf_text(path: Path) -> Tuple[str, int]:
@@ -14,35 +34,247 @@ def extract_pdf_text(path: Path) -> Tuple[str, int]:
         page_count = doc.page_count
     finally:
         doc.close()
-    text = "\n".join(texts).strip()
-    return text, page_count
+    return join_pages(texts), page_count
 
 
 def extract_pdf_text_from_bytes(content: bytes) -> Tuple[str, int]:
-    doc = fitz.open(stream=content, filetype="pdf")
+    cache = get_extraction_cache()
+    key = content_key(content) if cache else ""
+    pages = cache.get(key) if cache else None
+    if pages is None:
+        pages = extract_page_range(content, 0)
+        if cache:
+            cache.put(key, pages)
+    return join_pages(pages), len(pages)
+
+
+async def extract_pdf_text_async(source: PdfSource, key: str | None = None) -> Tuple[str, int]:
+    pages = await extract_pdf_pages_async(source, key)
+    return join_pages(pages), len(pages)
+
+
+async def extract_pdf_pages_async(source: PdfSource, key: str | None = None) -> List[str]:
+    return [text async for _, text in iter_pdf_pages_async(source, key)]
+
+
+async def extract_pdf_range_async(
+    source: PdfSource, key: str | None = None, start_page: int = 1, end_page: int | None = None
+) -> Tuple[List[str], int]:
+    # (요청 구간의 페이지 텍스트, 문서 전체 페이지 수)
+    pages = [text async for _, text in iter_pdf_pages_async(source, key, start_page, end_page)]
+    if start_page <= 1 and end_page is None:
+        return pages, len(pages)
+    return pages, await asyncio.to_thread(count_pages, source)
+
+
+async def iter_pdf_pages_async(
+    source: PdfSource, key: str | None = None, start_page: int = 1, end_page: int | None = None
+) -> AsyncIterator[Tuple[int, str]]:
+    # 같은 PDF(내용 해시 기준)는 캐시에서 바로 내보내고, 끝까지 추출한 결과만 캐시에 저장.
+    # start_page/end_page(1부터, 끝 포함)를 주면 해당 구간만 추출한다
+    start = max(0, start_page - 1)
+    whole_document = start == 0 and end_page is None
+    cache = get_extraction_cache()
+    if cache is None:
+        async for item in _iter_extracted_pages(source, start, end_page):
+            yield item
+        return
+    if key is None:
+        key = await asyncio.to_thread(_source_key, source)
+    cached = await asyncio.to_thread(cache.get, key)
+    if cached is not None:
+        stop = len(cached) if end_page is None else min(end_page, len(cached))
+        for index in range(start, stop):
+            yield index + 1, cached[index]
+        return
+    if not whole_document:
+        async for item in _iter_extracted_pages(source, start, end_page):
+            yield item
+        return
+    pages: List[str] = []
+    async for page, text in _iter_extracted_pages(source):
+        pages.append(text)
+        yield page, text
+    await asyncio.to_thread(cache.put, key, pages)
+
+
+def get_extraction_cache() -> ExtractionCache | None:
+    global _cache
+    if not settings.cache_enabled:
+        return None
+    if _cache is None:
+        _cache = ExtractionCache(
+            memory_max_chars=settings.cache_memory_max_chars,
+            disk_dir=settings.cache_dir,
+            disk_max_bytes=settings.cache_disk_max_bytes,
+        )
+    return _cache
+
+
+def get_admission_controller() -> AdmissionController:
+    global _admission
+    if _admission is None:
+        _admission = AdmissionController(
+            slots=settings.admission_slots,
+            max_queue=settings.admission_max_queue,
+            retry_after=settings.admission_retry_after_seconds,
+        )
+    return _admission
+
+
+async def _iter_extracted_pages(
+    source: PdfSource, start: int = 0, end: int | None = None
+) -> AsyncIterator[Tuple[int, str]]:
+    # 이벤트 루프를 막지 않도록 페이지 구간을 프로세스 풀에 분산해 추출하고,
+    # 앞쪽 구간이 끝나는 대로 (1부터 시작하는 페이지 번호, 텍스트)를 순서대로 내보낸다
+    page_count = await asyncio.to_thread(count_pages, source)
+    stop = page_count if end is None else min(end, page_count)
+    ranges = _plan_page_ranges(start, stop)
+    if len(ranges) <= 1:
+        pages = await asyncio.to_thread(extract_page_range, source, start, stop)
+        for offset, text in enumerate(pages):
+            yield start + offset + 1, text
+        return
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    futures = [loop.run_in_executor(executor, extract_page_range, source, start, end) for start, end in ranges]
     try:
-        texts = [page.get_text("text") for page in doc]
-        page_count = doc.page_count
+        for (start, _), future in zip(ranges, futures):
+            pages = await future
+            for offset, text in enumerate(pages):
+                yield start + offset + 1, text
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def extract_page_range(source: PdfSource, start: int, end: int | None = None) -> List[str]:
+    # 워커마다 자체 fitz 문서를 연다(fitz.Document는 프로세스 간 공유 불가).
+    # 경로로 넘기면 워커가 파일을 직접 열어 원본 bytes를 프로세스마다 복사하지 않는다
+    doc = _open_document(source)
+    try:
+        stop = doc.page_count if end is None else min(end, doc.page_count)
+        return [doc[index].get_text("text") for index in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def count_pages(source: PdfSource) -> int:
+    doc = _open_document(source)
+    try:
+        return doc.page_count
     finally:
         doc.close()
-    text = "\n".join(texts).strip()
-    return text, page_count
 
 
-def upload_pdf_to_s3(file_name: str, content: bytes) -> str:
+def join_pages(pages: List[str]) -> str:
+    return "\n".join(pages).strip()
+
+
+def join_pages_with_offsets(pages: List[str]) -> Tuple[str, List[int]]:
+    # join_pages 결과와 함께 각 페이지가 시작하는 문자 오프셋을 돌려준다
+    raw = "\n".join(pages)
+    text = raw.strip()
+    leading = len(raw) - len(raw.lstrip())
+    offsets: List[int] = []
+    position = 0
+    for page in pages:
+        offsets.append(min(max(0, position - leading), len(text)))
+        position += len(page) + 1
+    return text, offsets
+
+
+def _open_document(source: PdfSource) -> fitz.Document:
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source, filetype="pdf")
+
+
+def _source_key(source: PdfSource) -> str:
+    if isinstance(source, (bytes, bytearray)):
+        return content_key(source)
+    return file_key(source)
+
+
+def shutdown_extraction_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def extraction_pool_pids() -> List[int]:
+    # 현재 살아 있는 추출 프로세스 풀 워커의 PID(메모리 측정용)
+    executor = _executor
+    if executor is None:
+        return []
+    return list(getattr(executor, "_processes", None) or {})
+
+
+def _extract_workers() -> int:
+    return settings.extract_workers or os.cpu_count() or 1
+
+
+def _plan_page_ranges(start: int, stop: int) -> List[Tuple[int, int]]:
+    page_count = stop - start
+    if page_count <= 0:
+        return []
+    if _extract_workers() <= 1 or page_count < settings.extract_parallel_min_pages:
+        return [(start, stop)]
+    per_task = max(1, settings.extract_pages_per_task)
+    task_count = math.ceil(page_count / per_task)
+    return [(start + idx * per_task, min(stop, start + (idx + 1) * per_task)) for idx in range(task_count)]
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        workers = _extract_workers()
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        logger.info("PDF extraction pool started workers=%d", workers)
+    return _executor
+
+
+def upload_pdf_to_s3(file_name: str, source: PdfSource) -> str:
     if not settings.s3_bucket:
         raise RuntimeError("PDF_S3_BUCKET must be set for PDF ingest.")
     try:
-        import boto3
+        from boto3.s3.transfer import TransferConfig
     except ImportError as exc:
         raise RuntimeError("boto3 is required for PDF ingest. Install it and retry.") from exc
-    s3 = boto3.client(
-        "s3",
-        region_name=settings.s3_region or None,
-        aws_access_key_id=settings.s3_access_key_id or None,
-        aws_secret_access_key=settings.s3_secret_access_key or None,
-    )
+    s3 = _get_s3_client()
     suffix = Path(file_name).suffix.lower() or ".pdf"
     key = f"{settings.s3_prefix}{uuid.uuid4().hex}{suffix}"
-    s3.put_object(Bucket=settings.s3_bucket, Key=key, Body=content, ContentType="application/pdf")
+    # 임계값을 넘는 파일은 멀티파트로 나눠 파트를 병렬 업로드
+    transfer_config = TransferConfig(
+        multipart_threshold=settings.s3_multipart_threshold,
+        multipart_chunksize=settings.s3_multipart_chunk_size,
+        max_concurrency=settings.s3_max_concurrency,
+    )
+    extra_args = {"ContentType": "application/pdf"}
+    if isinstance(source, (bytes, bytearray)):
+        s3.upload_fileobj(io.BytesIO(source), settings.s3_bucket, key, ExtraArgs=extra_args, Config=transfer_config)
+    else:
+        s3.upload_file(str(source), settings.s3_bucket, key, ExtraArgs=extra_args, Config=transfer_config)
     return key
+
+
+def _get_s3_client() -> Any:
+    global _s3_client
+    if _s3_client is None:
+        with _s3_lock:
+            if _s3_client is None:
+                try:
+                    import boto3
+                    from botocore.config import Config
+                except ImportError as exc:
+                    raise RuntimeError("boto3 is required for PDF ingest. Install it and retry.") from exc
+                _s3_client = boto3.client(
+                    "s3",
+                    region_name=settings.s3_region or None,
+                    endpoint_url=settings.s3_endpoint_url or None,
+                    aws_access_key_id=settings.s3_access_key_id or None,
+                    aws_secret_access_key=settings.s3_secret_access_key or None,
+                    config=Config(max_pool_connections=max(10, settings.s3_max_concurrency)),
+                )
+    return _s3_client
@@ -0,0 +1,41 @@
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+# /proc/<pid>/status 기반 메모리 측정(Linux). RUSAGE_CHILDREN은 wait된 자식만 집계해
+# 살아 있는 프로세스 풀 워커는 빠지므로 워커 PID를 직접 읽는다
+
+
+def process_memory_mb(pid: int | str = "self") -> Optional[Dict[str, float]]:
+    # {"rss_mb": 현재, "peak_rss_mb": 최대(VmHWM)}, 읽을 수 없으면(종료/비Linux) None
+    try:
+        lines = Path(f"/proc/{pid}/status").read_text().splitlines()
+    except OSError:
+        return None
+    fields = {}
+    for line in lines:
+        key, _, value = line.partition(":")
+        if key in ("VmRSS", "VmHWM"):
+            fields[key] = int(value.split()[0]) / 1024
+    if len(fields) < 2:
+        return None
+    return {"rss_mb": round(fields["VmRSS"], 1), "peak_rss_mb": round(fields["VmHWM"], 1)}
+
+
+def reset_peak_rss(pid: int | str = "self") -> bool:
+    # VmHWM을 현재 RSS로 되돌린다(Linux 4.0+, 측정 구간별 최대치용)
+    try:
+        Path(f"/proc/{pid}/clear_refs").write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def pool_memory_mb(pids: Iterable[int]) -> Dict[str, float]:
+    # 워커별 수치를 합계/최대로 요약(워커는 각자 별도 메모리를 쓰므로 합계가 풀 전체 사용량)
+    samples = [sample for sample in (process_memory_mb(pid) for pid in pids) if sample is not None]
+    return {
+        "workers": len(samples),
+        "rss_mb": round(sum((sample["rss_mb"] for sample in samples), 0.0), 1),
+        "peak_rss_mb": round(sum((sample["peak_rss_mb"] for sample in samples), 0.0), 1),
+        "max_worker_peak_rss_mb": max((sample["peak_rss_mb"] for sample in samples), default=0.0),
+    }
@@ -0,0 +1,47 @@
+import hashlib
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class SpooledUpload:
+    path: Path
+    size: int
+    sha256: str
+
+    def cleanup(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+async def spool_upload(
+    file: UploadFile, *, spool_dir: str, max_bytes: int, chunk_size: int
+) -> SpooledUpload:
+    # 업로드 본문을 고정 크기 청크로 임시 파일에 기록하면서 해시를 계산하고 한도를 넘으면 중단.
+    # 본문은 Starlette가 이미 받아 둔 상태이므로 큰 요청은 main의 Content-Length 검사에서 먼저 거절된다.
+    # 디스크 쓰기는 이벤트 루프를 막지 않도록 스레드풀에서 수행
+    directory = Path(spool_dir) if spool_dir else Path(tempfile.gettempdir())
+    directory.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, name = tempfile.mkstemp(prefix="upload-", suffix=".pdf", dir=directory)
+    path = Path(name)
+    try:
+        with open(fd, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes.")
+                digest.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return SpooledUpload(path=path, size=size, sha256=digest.hexdigest())
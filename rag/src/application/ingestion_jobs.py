@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from application.ingestion_service import IngestionService
+from domain.models import IngestionJob
+
+logger = logging.getLogger(__name__)
+
+# 단계별 진행률(단계 시작 시점 기준)
+STAGE_PROGRESS = {
+    "queued": 0.0,
+    "extracting": 0.1,
+    "chunking": 0.4,
+    "embedding": 0.5,
+    "upserting": 0.9,
+    "done": 1.0,
+}
+_ACTIVE = ("queued", "running")
+
+
+class JobQueueFullError(RuntimeError):
+    pass
+
+
+class JobConflictError(RuntimeError):
+    pass
+
+
+class IngestionJobManager:
+    # 업로드 인입을 bounded 워커 풀에서 백그라운드로 실행하고 상태를 보관.
+    # 경로당 활성 작업은 하나: 같은 내용(sha256)이면 기존 작업을 돌려주고, 다른 내용이면 거절한다.
+    # 다른 경로(파일명/프로젝트)라도 같은 내용이 대기/실행 중이면 다시 추출/임베딩하지 않고 그 작업을 돌려준다
+    def __init__(
+        self,
+        service_factory: Callable[[], IngestionService],
+        *,
+        workers: int,
+        max_queue: int,
+        history: int,
+    ) -> None:
+        self._service_factory = service_factory
+        self.max_queue = max(0, max_queue)
+        self.history = max(1, history)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ingest-job")
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._active_by_path: Dict[str, str] = {}
+        self._active_by_sha256: Dict[str, str] = {}
+
+    def submit(
+        self, file_path: Path, base_dir: Path, sha256: str, staged_path: Optional[Path] = None
+    ) -> Tuple[IngestionJob, bool]:
+        # (작업, 중복 여부). staged_path는 작업이 접수된 뒤에만 file_path로 옮기므로
+        # 거절/중복이면 기존 파일(진행 중인 작업이 읽는 중일 수 있음)을 건드리지 않는다
+        key = str(file_path)
+        with self._lock:
+            existing = self._active_by_path.get(key)
+            if existing is not None:
+                if self._jobs[existing].sha256 == sha256:
+                    return self._jobs[existing], True
+                raise JobConflictError(f"An ingestion job for {file_path.name} is already in progress.")
+            same_content = self._active_by_sha256.get(sha256)
+            if same_content is not None:
+                return self._jobs[same_content], True
+            queued = sum(1 for job in self._jobs.values() if job.status == "queued")
+            if queued >= self.max_queue:
+                raise JobQueueFullError("Ingestion queue is full.")
+            if staged_path is not None:
+                os.replace(staged_path, file_path)
+            job = IngestionJob(
+                job_id=uuid.uuid4().hex,
+                file_name=file_path.name,
+                sha256=sha256,
+                status="queued",
+                stage="queued",
+                progress=0.0,
+                created_at=_now(),
+                path=key,
+            )
+            self._jobs[job.job_id] = job
+            self._active_by_path[key] = job.job_id
+            self._active_by_sha256[sha256] = job.job_id
+            self._trim()
+        self._executor.submit(self._run, job.job_id, file_path, base_dir, sha256, key)
+        print(f"[IngestJob] queued job_id={job.job_id} file={file_path.name}", flush=True)
+        return job, False
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return counts
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job_id: str, file_path: Path, base_dir: Path, sha256: str, key: str) -> None:
+        self._update(job_id, status="running", started_at=_now())
+        try:
+            chunk_count = self._service_factory().ingest_pdf_file(
+                file_path, base_dir, sha256=sha256, on_stage=lambda stage: self._set_stage(job_id, stage)
+            )
+        except Exception as exc:
+            logger.exception("Ingestion job failed: job_id=%s file=%s", job_id, file_path)
+            self._finish(job_id, key, status="failed", error=f"{type(exc).__name__}: {exc}")
+            return
+        if chunk_count == 0:
+            self._finish(job_id, key, status="failed", error="No text could be extracted from the PDF.")
+            return
+        self._finish(job_id, key, status="succeeded", chunk_count=chunk_count)
+
+    def _set_stage(self, job_id: str, stage: str) -> None:
+        self._update(job_id, stage=stage, progress=STAGE_PROGRESS.get(stage, 0.0))
+
+    def _finish(self, job_id: str, key: str, **changes) -> None:
+        if changes.get("status") == "succeeded":
+            changes.update(stage="done", progress=1.0)
+        self._update(job_id, finished_at=_now(), **changes)
+        with self._lock:
+            if self._active_by_path.get(key) == job_id:
+                del self._active_by_path[key]
+            job = self._jobs.get(job_id)
+            if job is not None and self._active_by_sha256.get(job.sha256) == job_id:
+                del self._active_by_sha256[job.sha256]
+            self._trim()
+        print(f"[IngestJob] {changes['status']} job_id={job_id}", flush=True)
+
+    def _update(self, job_id: str, **changes) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._jobs[job_id] = replace(job, **changes)
+
+    def _trim(self) -> None:
+        # 끝난 작업은 history개까지만 보관(오래된 것부터 제거, 진행 중인 작업은 유지)
+        finished = [job_id for job_id, job in self._jobs.items() if job.status not in _ACTIVE]
+        for job_id in finished[: max(0, len(self._jobs) - self.history)]:
+            del self._jobs[job_id]
+
+
+def _now() -> datetime:
+    return datetime.now(ZoneInfo("Asia/Seoul"))
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import settings
+from infrastructure.ingestion.chunk import CHUNKER_VERSION, chunk_pages
+from infrastructure.ingestion.docs_loader import DocumentPayload, load_pdfs_batch
+from infrastructure.ingestion.embed import embed_text, embedding_model_id
+from infrastructure.ingestion.index import delete_document, index_embeddings
+from infrastructure.ingestion.manifest import FileFingerprint, IngestionManifest, ManifestEntry
+
+logger = logging.getLogger(__name__)
+
+# 스테이지 종료 신호
+_DONE = object()
+
+
+class StageStats:
+    def __init__(self, name: str, workers: int) -> None:
+        self.name = name
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._items = 0
+        self._units = 0
+        self._errors = 0
+        self._busy = 0.0
+
+    def record(self, seconds: float, items: int = 1, units: int = 0) -> None:
+        with self._lock:
+            self._items += items
+            self._units += units
+            self._busy += seconds
+
+    def error(self, items: int = 1) -> None:
+        with self._lock:
+            self._errors += items
+
+    def snapshot(self, wall_seconds: float) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "items": self._items,
+                "units": self._units,
+                "errors": self._errors,
+                "busy_seconds": round(self._busy, 3),
+                "items_per_sec": round(self._items / wall_seconds, 2) if wall_seconds else 0.0,
+                "units_per_sec": round(self._units / wall_seconds, 2) if wall_seconds else 0.0,
+            }
+
+
+@dataclass
+class _DocWork:
+    payload: DocumentPayload
+    sha256: str
+    fingerprint: FileFingerprint
+    chunks: List[str] = field(default_factory=list)
+    token_counts: List[int] = field(default_factory=list)
+    page_ranges: List[Tuple[int, int]] = field(default_factory=list)
+    vectors: List[Optional[List[float]]] = field(default_factory=list)
+    remaining: int = 0
+    failed: bool = False
+
+
+class IngestionPipeline:
+    # 추출 -> 청킹 -> (배치 묶기) -> 임베딩 -> 업서트를 스레드 스테이지로 나누고 사이를 bounded queue로 연결.
+    # 문서는 업서트가 끝난 뒤에만 매니페스트에 기록되므로, 중단 후 재실행하면 끝나지 않은 문서부터 이어서 처리
+    def __init__(self, manifest: IngestionManifest) -> None:
+        self._manifest = manifest
+        self._batch_size = max(1, settings.embedding_batch_size)
+        self._flush_seconds = max(1, settings.ingest_batch_flush_ms) / 1000
+        self._checkpoint_every = max(1, settings.ingest_checkpoint_every)
+        self._workers = {
+            "extract": max(1, settings.ingest_extract_workers),
+            "chunk": max(1, settings.ingest_chunk_workers),
+            "pack": 1,
+            "embed": max(1, settings.ingest_embed_workers),
+            "upsert": max(1, settings.ingest_upsert_workers),
+        }
+        self._stats = {name: StageStats(name, workers) for name, workers in self._workers.items()}
+        self._doc_lock = threading.Lock()
+        self._counters = {"ingested": 0, "empty": 0, "failed": 0}
+
+    def run(self, base_dir: Path, pending: Dict[Path, Tuple[str, str, FileFingerprint]]) -> Dict[str, Any]:
+        # pending: 경로 -> (doc_id, sha256, fingerprint)
+        size = max(1, settings.ingest_queue_size)
+        path_queue: queue.Queue = queue.Queue()
+        chunk_queue: queue.Queue = queue.Queue(maxsize=size)
+        pack_queue: queue.Queue = queue.Queue(maxsize=size)
+        embed_queue: queue.Queue = queue.Queue(maxsize=size)
+        upsert_queue: queue.Queue = queue.Queue(maxsize=size)
+        paths = list(pending)
+        batch = max(1, settings.pdf_batch_size)
+        for start in range(0, len(paths), batch):
+            path_queue.put(paths[start : start + batch])
+
+        stages: List[Tuple[str, Callable[..., None], tuple, Optional[queue.Queue]]] = [
+            ("extract", self._extract_worker, (path_queue, chunk_queue, base_dir, pending), chunk_queue),
+            ("chunk", self._chunk_worker, (chunk_queue, pack_queue), pack_queue),
+            ("pack", self._pack_worker, (pack_queue, embed_queue), embed_queue),
+            ("embed", self._embed_worker, (embed_queue, upsert_queue), upsert_queue),
+            ("upsert", self._upsert_worker, (upsert_queue,), None),
+        ]
+        for _ in range(self._workers["extract"]):
+            path_queue.put(_DONE)
+        started = time.perf_counter()
+        threads: List[List[threading.Thread]] = []
+        for name, target, args, _ in stages:
+            group = [
+                threading.Thread(target=target, args=args, name=f"ingest-{name}-{index}", daemon=True)
+                for index in range(self._workers[name])
+            ]
+            for thread in group:
+                thread.start()
+            threads.append(group)
+        # 앞 스테이지의 워커가 모두 끝나면 다음 스테이지 워커 수만큼 종료 신호 전달
+        for index, (_, _, _, out_queue) in enumerate(stages):
+            for thread in threads[index]:
+                thread.join()
+            if out_queue is not None:
+                for _ in range(self._workers[stages[index + 1][0]]):
+                    out_queue.put(_DONE)
+        self._manifest.save()
+        wall = time.perf_counter() - started
+        return {
+            **self._counters,
+            "elapsed_seconds": round(wall, 3),
+            "stages": {name: stats.snapshot(wall) for name, stats in self._stats.items()},
+        }
+
+    def _extract_worker(
+        self,
+        in_queue: queue.Queue,
+        out_queue: queue.Queue,
+        base_dir: Path,
+        pending: Dict[Path, Tuple[str, str, FileFingerprint]],
+    ) -> None:
+        stats = self._stats["extract"]
+        while (paths := in_queue.get()) is not _DONE:
+            started = time.perf_counter()
+            try:
+                payloads = load_pdfs_batch(paths, base_dir)
+            except Exception:
+                logger.exception("PDF batch extraction failed: first=%s", paths[0])
+                stats.error(len(paths))
+                self._count("failed", len(paths))
+                continue
+            pages = sum(int(payload.metadata.get("page_count", 0)) for payload in payloads)
+            stats.record(time.perf_counter() - started, items=len(payloads), units=pages)
+            for path, payload in zip(paths, payloads):
+                if payload.error:
+                    # 추출 실패는 기록하지 않아 다음 실행에서 다시 시도(기존 포인트는 유지)
+                    stats.error()
+                    self._count("failed")
+                    continue
+                if not payload.text:
+                    self._drop_stale(payload.doc_id)
+                    continue
+                _, sha256, fingerprint = pending[path]
+                out_queue.put(_DocWork(payload=payload, sha256=sha256, fingerprint=fingerprint))
+
+    def _chunk_worker(self, in_queue: queue.Queue, out_queue: queue.Queue) -> None:
+        stats = self._stats["chunk"]
+        while (work := in_queue.get()) is not _DONE:
+            started = time.perf_counter()
+            try:
+                pieces = chunk_pages(work.payload.text, work.payload.page_offsets)
+                work.chunks = [piece.text for piece in pieces]
+                work.token_counts = [piece.tokens for piece in pieces]
+                work.page_ranges = [(piece.page_start, piece.page_end) for piece in pieces]
+            except Exception:
+                logger.exception("Chunking failed: %s", work.payload.doc_id)
+                stats.error()
+                self._count("failed")
+                continue
+            if not work.chunks:
+                self._drop_stale(work.payload.doc_id)
+                continue
+            work.vectors = [None] * len(work.chunks)
+            work.remaining = len(work.chunks)
+            stats.record(time.perf_counter() - started, units=len(work.chunks))
+            out_queue.put(work)
+
+    def _pack_worker(self, in_queue: queue.Queue, out_queue: queue.Queue) -> None:
+        # 여러 문서의 청크를 embedding_batch_size만큼 채워 넘기고, 입력이 끊기면 flush 시간 뒤 부분 배치를 넘긴다
+        # (stats: items=문서, units=배치 / embed: items=배치, units=청크)
+        stats = self._stats["pack"]
+        batch: List[Tuple[_DocWork, int]] = []
+        while True:
+            try:
+                work = in_queue.get(timeout=self._flush_seconds if batch else None)
+            except queue.Empty:
+                out_queue.put(batch)
+                stats.record(0.0, items=0, units=1)
+                batch = []
+                continue
+            if work is _DONE:
+                break
+            stats.record(0.0)
+            for index in range(len(work.chunks)):
+                batch.append((work, index))
+                if len(batch) >= self._batch_size:
+                    out_queue.put(batch)
+                    stats.record(0.0, items=0, units=1)
+                    batch = []
+        if batch:
+            out_queue.put(batch)
+            stats.record(0.0, items=0, units=1)
+
+    def _embed_worker(self, in_queue: queue.Queue, out_queue: queue.Queue) -> None:
+        stats = self._stats["embed"]
+        while (batch := in_queue.get()) is not _DONE:
+            started = time.perf_counter()
+            try:
+                vectors: List[Optional[List[float]]] = embed_text(
+                    [work.chunks[index] for work, index in batch],
+                    [work.token_counts[index] for work, index in batch],
+                )
+            except Exception:
+                # 한 문서 때문에 같은 배치의 다른 문서까지 실패하지 않도록 문서별로 다시 시도
+                logger.exception("Embedding batch failed, retrying per document: size=%d", len(batch))
+                vectors = self._embed_per_document(batch)
+            stats.record(time.perf_counter() - started, units=sum(1 for vector in vectors if vector is not None))
+            for position, (work, index) in enumerate(batch):
+                with self._doc_lock:
+                    if vectors[position] is None:
+                        work.failed = True
+                    else:
+                        work.vectors[index] = vectors[position]
+                    work.remaining -= 1
+                    finished = work.remaining == 0
+                if not finished:
+                    continue
+                if work.failed:
+                    stats.error()
+                    self._count("failed")
+                else:
+                    out_queue.put(work)
+
+    def _embed_per_document(self, batch: List[Tuple[_DocWork, int]]) -> List[Optional[List[float]]]:
+        vectors: List[Optional[List[float]]] = [None] * len(batch)
+        groups: Dict[int, List[int]] = {}
+        for position, (work, _) in enumerate(batch):
+            groups.setdefault(id(work), []).append(position)
+        for positions in groups.values():
+            work = batch[positions[0]][0]
+            try:
+                indices = [batch[position][1] for position in positions]
+                embedded = embed_text(
+                    [work.chunks[index] for index in indices], [work.token_counts[index] for index in indices]
+                )
+            except Exception:
+                logger.exception("Embedding failed: %s", work.payload.doc_id)
+                continue
+            for position, vector in zip(positions, embedded):
+                vectors[position] = vector
+        return vectors
+
+    def _upsert_worker(self, in_queue: queue.Queue) -> None:
+        stats = self._stats["upsert"]
+        while (work := in_queue.get()) is not _DONE:
+            started = time.perf_counter()
+            payload = work.payload
+            try:
+                # 같은 point id는 덮어쓰고, 줄어든 꼬리 청크는 업서트에서 정리
+                index_embeddings(payload.doc_id, work.chunks, work.vectors, payload.metadata, work.page_ranges)
+            except Exception:
+                logger.exception("Upsert failed: %s", payload.doc_id)
+                stats.error()
+                self._count("failed")
+                continue
+            self._manifest.put(
+                payload.doc_id,
+                ManifestEntry(
+                    sha256=work.sha256,
+                    size=work.fingerprint.size,
+                    mtime_ns=work.fingerprint.mtime_ns,
+                    chunker_version=CHUNKER_VERSION,
+                    embedding_model=embedding_model_id(),
+                    chunk_count=len(work.chunks),
+                ),
+            )
+            stats.record(time.perf_counter() - started, units=len(work.chunks))
+            if self._count("ingested") % self._checkpoint_every == 0:
+                self._checkpoint()
+
+    def _drop_stale(self, doc_id: str) -> None:
+        # 바뀐 문서가 텍스트/청크 없이 끝나면 이전 버전의 포인트와 매니페스트 항목을 지운다
+        # (매니페스트에 남기지 않으므로 다음 실행에서 다시 시도)
+        self._count("empty")
+        try:
+            delete_document(doc_id)
+        except Exception:
+            logger.exception("Stale point cleanup failed: %s", doc_id)
+            return
+        self._manifest.remove(doc_id)
+
+    def _checkpoint(self) -> None:
+        # 저장 실패(디스크 가득 참 등)로 업서트 워커가 죽으면 큐가 막혀 run()이 끝나지 않으므로 로그만 남긴다.
+        # 완료된 문서는 메모리의 매니페스트에 남아 있어 다음 체크포인트/종료 시 다시 저장된다
+        try:
+            self._manifest.save()
+        except Exception:
+            logger.exception("Manifest checkpoint failed.")
+
+    def _count(self, key: str, amount: int = 1) -> int:
+        with self._doc_lock:
+            self._counters[key] += amount
+            return self._counters[key]
@@ -1,32 +1,95 @@
 import logging
 from pathlib import Path
+from typing import Any, Callable, Dict, Sequence, Tuple
 
-from infrastructure.ingestion.chunk import chunk_text
-from infrastructure.ingestion.docs_loader import DocumentPayload, iter_pdfs_from_dir, load_pdf
-from infrastructure.ingestion.embed import embed_text
-from infrastructure.ingestion.index import index_embeddings
+from application.ingestion_pipeline import IngestionPipeline
+from config import settings
+from infrastructure.ingestion.chunk import CHUNKER_VERSION, chunk_pages
+from infrastructure.ingestion.docs_loader import (
+    DocumentPayload,
+    iter_pdfs_from_dir,
+    list_pdf_paths,
+    load_pdf,
+    relative_doc_id,
+)
+from infrastructure.ingestion.embed import embed_text, embedding_model_id
+from infrastructure.ingestion.index import delete_document, index_embeddings
+from infrastructure.ingestion.manifest import (
+    FileFingerprint,
+    IngestionManifest,
+    ManifestEntry,
+    file_sha256,
+    fingerprint,
+    get_manifest,
+)
 
 logger = logging.getLogger(__name__)
 
+# 진행 단계 알림(extracting / chunking / embedding / upserting)
+StageCallback = Callable[[str], None]
+
+
+def _ignore_stage(stage: str) -> None:
+    pass
+
 
 class IngestionService:
-    def ingest(self, doc_id: str, text: str, metadata: dict) -> None:
-        # 1/2단계: 원문 -> 청크
-        chunks = chunk_text(text)
+    def ingest(
+        self,
+        doc_id: str,
+        text: str,
+        metadata: dict,
+        on_stage: StageCallback | None = None,
+        page_offsets: Sequence[int] = (),
+    ) -> int:
+        report = on_stage or _ignore_stage
+        # 1/2단계: 원문 -> 청크(페이지 오프셋이 있으면 청크마다 페이지 범위 기록)
+        report("chunking")
+        pieces = chunk_pages(text, page_offsets)
+        chunks = [piece.text for piece in pieces]
+        if not chunks:
+            # 청크가 없으면 이전 버전의 포인트가 남지 않도록 지운다
+            delete_document(doc_id)
+            return 0
         # 3단계: 청크 -> 임베딩
-        vectors = embed_text(chunks)
+        report("embedding")
+        vectors = embed_text(chunks, [piece.tokens for piece in pieces])
         # 3단계: 임베딩 -> 벡터 DB 저장
-        index_embeddings(doc_id, chunks, vectors, metadata)
+        report("upserting")
+        index_embeddings(doc_id, chunks, vectors, metadata, [(piece.page_start, piece.page_end) for piece in pieces])
+        return len(chunks)
 
-    def ingest_data_dir(self, data_dir: str) -> None:
-        saw_any = False
-        for payload in iter_pdfs_from_dir(data_dir):
-            saw_any = True
-            if not payload.text:
-                continue
-            self.ingest(payload.doc_id, payload.text, payload.metadata)
-        if not saw_any:
+    def ingest_data_dir(self, data_dir: str) -> Dict[str, Any]:
+        # 매니페스트와 비교해 바뀐 파일만 다시 인입하고, 사라진 파일의 포인트는 삭제
+        base = Path(data_dir).resolve()
+        manifest = get_manifest(self._manifest_path(base))
+        pdf_paths = list_pdf_paths(base)
+        if not pdf_paths:
             logger.warning("No PDF files found under data dir: %s", data_dir)
+        summary: Dict[str, Any] = {"scanned": len(pdf_paths), "skipped": 0, "removed": 0}
+        pending: Dict[Path, Tuple[str, str, FileFingerprint]] = {}
+        seen = set()
+        for path in pdf_paths:
+            doc_id = relative_doc_id(path, base)
+            seen.add(doc_id)
+            current = fingerprint(path)
+            sha256 = manifest.detect_change(
+                doc_id, path, chunker_version=CHUNKER_VERSION, embedding_model=embedding_model_id()
+            )
+            if sha256 is None:
+                summary["skipped"] += 1
+                continue
+            pending[path] = (doc_id, sha256, current)
+        for doc_id in manifest.paths():
+            if doc_id in seen:
+                continue
+            delete_document(doc_id)
+            manifest.remove(doc_id)
+            summary["removed"] += 1
+        # 추출/청킹/임베딩/업서트를 파이프라인으로 겹쳐 실행(완료된 문서는 주기적으로 매니페스트에 체크포인트)
+        summary.update(IngestionPipeline(manifest).run(base, pending))
+        print(f"[Ingestion] data dir synced {summary}", flush=True)
+        return summary
 
     def extract_raw_texts(self, data_dir: str | None = None) -> list[DocumentPayload]:
         resolved_dir = data_dir or str(Path(__file__).resolve().parents[1] / "data")
@@ -35,13 +98,57 @@ class IngestionService:
             logger.warning("No PDF files found under data dir: %s", resolved_dir)
         return payloads
 
-    def ingest_pdf_file(self, file_path: Path, base_dir: Path) -> None:
+    def ingest_pdf_file(
+        self, file_path: Path, base_dir: Path, sha256: str | None = None, on_stage: StageCallback | None = None
+    ) -> int:
         print(f"[Ingestion] start file={file_path}", flush=True)
+        report = on_stage or _ignore_stage
+        manifest = get_manifest(self._manifest_path(base_dir.resolve()))
+        current = fingerprint(file_path)
+        report("extracting")
         payload = load_pdf(file_path, base_dir)
         if not payload.text:
             print(f"[Ingestion] empty text file={file_path}", flush=True)
             logger.warning("Empty PDF text extracted: %s", file_path)
-            return
+            if not payload.error:
+                # 텍스트가 없는 새 버전이면 이전 버전의 포인트/매니페스트 항목을 지운다
+                delete_document(payload.doc_id)
+                manifest.remove(payload.doc_id)
+                manifest.save()
+            return 0
         print(f"[Ingestion] extracted chars={len(payload.text)} file={file_path}", flush=True)
-        self.ingest(payload.doc_id, payload.text, payload.metadata)
+        chunk_count = self._reingest(manifest, payload, sha256 or file_sha256(file_path), current, report)
+        manifest.save()
         print(f"[Ingestion] upsert done doc_id={payload.doc_id}", flush=True)
+        return chunk_count
+
+    def _reingest(
+        self,
+        manifest: IngestionManifest,
+        payload: DocumentPayload,
+        sha256: str,
+        current: FileFingerprint,
+        on_stage: StageCallback | None = None,
+    ) -> int:
+        # 같은 point id는 덮어쓰고, 줄어든 꼬리 청크는 업서트에서 정리
+        chunk_count = self.ingest(payload.doc_id, payload.text, payload.metadata, on_stage, payload.page_offsets)
+        if chunk_count == 0:
+            manifest.remove(payload.doc_id)
+            return 0
+        manifest.put(
+            payload.doc_id,
+            ManifestEntry(
+                sha256=sha256,
+                size=current.size,
+                mtime_ns=current.mtime_ns,
+                chunker_version=CHUNKER_VERSION,
+                embedding_model=embedding_model_id(),
+                chunk_count=chunk_count,
+            ),
+        )
+        return chunk_count
+
+    def _manifest_path(self, base_dir: Path) -> Path:
+        if settings.ingest_manifest_path:
+            return Path(settings.ingest_manifest_path)
+        return base_dir / ".ingest_manifest.json"
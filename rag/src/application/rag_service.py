@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from config import settings
 from domain.models import SearchResult
@@ -23,15 +23,19 @@ class RagService:
         self._safety = safety
         self._documents = documents
 
-    def search(self, query: str, top_k: Optional[int] = None) -> List[SearchResult]:
+    def search(
+        self, query: str, top_k: Optional[int] = None, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
         k = top_k or settings.top_k
         # 4/5단계: 검색 -> 재정렬
-        raw = self._vector_store.search(query, k=settings.rerank_k)
+        raw = self._vector_store.search(query, k=settings.rerank_k, filters=filters)
         ranked = self._reranker.rerank(query, raw, top_k=k)
         return self._enrich(ranked)
 
-    def answer(self, query: str, top_k: Optional[int] = None) -> tuple[str, List[SearchResult]]:
-        results = self.search(query, top_k=top_k)
+    def answer(
+        self, query: str, top_k: Optional[int] = None, filters: Optional[Dict[str, Any]] = None
+    ) -> tuple[str, List[SearchResult]]:
+        results = self.search(query, top_k=top_k, filters=filters)
         # 6단계: 생성(프롬프트 + 컨텍스트)
         prompt = self._prompt_builder.build(query, results)
         self._safety.ensure_safe(prompt)
@@ -9,7 +9,8 @@ import logging
 from config import settings
 from domain.models import SearchResult
 from infrastructure.mariadb_repo import MariaDBRepository
-from infrastructure.qdrant_store import QdrantAdapter
+from infrastructure.search_cache import with_search_cache
+from infrastructure.vector_store import create_vector_store
 
 
 @dataclass(frozen=True)
@@ -28,7 +29,8 @@ class RiskReportRetriever:
     # 리스크 리포트에 필요한 데이터를 MariaDB/Qdrant에서 수집하는 리트리버
     def __init__(self) -> None:
         self._repo = MariaDBRepository()
-        self._vector = QdrantAdapter()
+        # 같은 주차의 리포트 재요청은 같은 템플릿 쿼리라 검색 결과 캐시로 재임베딩/재검색을 생략
+        self._vector = with_search_cache(create_vector_store(settings.vector_provider))
 
     def fetch(self, *, project_id: str, week_start: date, week_end: date) -> RiskReportContext:
         print("[RiskReport] retriever start", flush=True)
@@ -67,7 +69,10 @@ class RiskReportRetriever:
         query = f"프로젝트 {project_id} 일정 지연 리스크 분석 ({week_start}~{week_end})"
         print(f"[RiskReport] retriever vector_query={query}", flush=True)
         logger.info("RiskReport vector_query=%s top_k=%d", query, settings.top_k)
-        results = self._vector.search(query, k=settings.top_k)
+        # 해당 프로젝트 문서 + 전사 공용 문서(규정/가이드)만 검색
+        results = self._vector.search(
+            query, k=settings.top_k, filters={"project_id": [project_id, settings.shared_project_id]}
+        )
         print(f"[RiskReport] retriever vector_search_results={len(results)}", flush=True)
         return [self._to_evidence(item) for item in results]
 
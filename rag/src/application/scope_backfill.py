@@ -0,0 +1,46 @@
+import logging
+import threading
+from typing import Dict, Optional
+
+from config import settings
+from infrastructure.ingestion.docs_loader import project_for
+from infrastructure.qdrant_store import QdrantAdapter
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_unscoped(adapter: QdrantAdapter, page_size: int = 1000, dry_run: bool = False) -> Dict[str, dict]:
+    # project_id 도입 전에 적재된 point는 프로젝트 필터 검색에서 빠지므로 doc_id 경로 규칙으로 project_id를 채운다
+    docs = {
+        doc_id: {**metadata, "project_id": metadata.get("project_id") or project_for(doc_id)}
+        for doc_id, metadata in adapter.unscoped_docs(page_size).items()
+    }
+    if docs and not dry_run:
+        adapter.backfill_scope(docs)
+    return docs
+
+
+def start_scope_backfill() -> Optional[threading.Thread]:
+    # 앱 시작 시 백그라운드 스레드로 한 번 실행(검색 요청은 기다리지 않고, 끝나기 전에는 해당 문서가 필터 결과에서 빠진다)
+    if settings.vector_provider != "qdrant" or not settings.qdrant_backfill_on_startup:
+        return None
+    thread = threading.Thread(target=_run_scope_backfill, name="qdrant-scope-backfill", daemon=True)
+    thread.start()
+    return thread
+
+
+def _run_scope_backfill() -> None:
+    adapter = QdrantAdapter()
+    try:
+        if not adapter.collection_exists():
+            return
+        docs = backfill_unscoped(adapter)
+    except Exception:
+        logger.exception(
+            "Failed to backfill project_id in %s; unscoped points are excluded from filtered search. "
+            "Run python -m tools.backfill_payload.",
+            adapter.collection,
+        )
+        return
+    if docs:
+        logger.warning("Backfilled project_id for %d unscoped documents in %s.", len(docs), adapter.collection)
@@ -1,3 +1,4 @@
+import tempfile
 from pathlib import Path
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -9,23 +10,109 @@ class Settings(BaseSettings):
     app_name: str = "rag"
     environment: str = "dev"
     data_dir: str = str(Path(__file__).resolve().parents[1] / "data")
+    # 비어 있으면 data_dir/.ingest_manifest.json
+    ingest_manifest_path: str = ""
+    upload_chunk_size: int = 1024 * 1024
+    upload_max_bytes: int = 200 * 1024 * 1024
+    # 멀티파트 본문을 받기 전에 Content-Length로 거절하는 한도(0이면 upload_max_bytes + 멀티파트 여유분)
+    max_request_bytes: int = 0
+    multipart_overhead_bytes: int = 1024 * 1024
+    # /upload/pdf 백그라운드 인입 작업(워커 수 / 대기열 한도 / 완료 작업 보관 개수)
+    ingest_job_workers: int = 2
+    ingest_job_max_queue: int = 32
+    ingest_job_history: int = 1000
 
     # Vector store
-    vector_provider: str = "qdrant"
+    vector_provider: str = "qdrant"  # qdrant | local
+    # local provider 저장 위치(비우면 data_dir/.vectors). 컬렉션 이름은 qdrant_collection을 같이 쓴다
+    local_vector_dir: str = ""
     qdrant_url: str = "http://localhost:6333"
     qdrant_api_key: str = ""
     qdrant_collection: str = "rag_chunks"
+    # 업서트를 batch_size개씩 나눠 parallelism개 스레드로 전송. wait=False면 마지막 정리 삭제(wait=True)가 배리어 역할
+    qdrant_upsert_batch_size: int = 256
+    qdrant_upsert_parallelism: int = 4
+    qdrant_upsert_wait: bool = True
+    # 검색 결과 캐시(메모리 LRU + redis_url이 있으면 Redis 계층). 업서트/삭제 시 컬렉션 버전으로 무효화
+    search_cache_enabled: bool = True
+    search_cache_ttl: float = 300.0
+    search_cache_max_items: int = 2048
+    search_cache_redis_prefix: str = "rag:search"
+    redis_url: str = ""
+    # 컬렉션 존재 여부/차원/설정 캐시 유지 시간(초)
+    qdrant_collection_cache_ttl: float = 60.0
+    # HNSW 인덱스/양자화(컬렉션 생성 시 적용, 기존 컬렉션은 tools.migrate_collection으로 변경)
+    qdrant_hnsw_m: int = 16
+    qdrant_hnsw_ef_construct: int = 100
+    qdrant_hnsw_on_disk: bool = False
+    # 원본 float 벡터를 디스크(mmap)에 두고 RAM에는 양자화 벡터만 유지
+    qdrant_vectors_on_disk: bool = False
+    qdrant_quantization: str = "none"  # none | scalar | binary
+    qdrant_quantization_always_ram: bool = True
+    # 검색 시 HNSW ef(0이면 서버 기본값), 양자화 후보를 원본 벡터로 재정렬할지와 후보 배수
+    qdrant_search_ef: int = 0
+    qdrant_search_rescore: bool = True
+    qdrant_search_oversampling: float = 2.0
+    # project_id 없이 적재된 문서(규정/가이드 등)가 속하는 공용 프로젝트 id
+    shared_project_id: str = "global"
+    # 앱 시작 시 project_id 없이 적재된 기존 point를 백그라운드에서 찾아 payload를 채운다(검색은 기다리지 않음)
+    qdrant_backfill_on_startup: bool = True
 
     # Retrieval knobs
     top_k: int = 5
     rerank_k: int = 10
 
-    # Embeddings
+    # Chunking (token counts use the embedding model's tokenizer)
+    chunk_max_tokens: int = 512
+    chunk_overlap_tokens: int = 64
+
+    # Embeddings (backend: huggingface | onnx)
+    embedding_backend: str = "huggingface"
     embedding_model: str = "BAAI/bge-m3"
     embedding_normalize: bool = True
+    embedding_max_length: int = 8192
+    # ONNX 세션 스레드 수(0이면 코어 수만큼)
+    embedding_threads: int = 0
+    # `python -m tools.onnx_embedder export`로 만든 디렉터리(model.onnx / model_quantized.onnx + 토크나이저)
+    embedding_onnx_dir: str = ""
+    embedding_onnx_quantized: bool = False
+    embedding_batch_size: int = 64
+    # 한 번의 forward에 들어가는 (최대 길이 x 개수) 토큰 예산 - 길이가 비슷한 입력끼리 묶어 패딩을 줄인다
+    embedding_batch_tokens: int = 16384
+    # (모델, normalize, 텍스트 해시) 임베딩 캐시. 경로가 비어 있으면 메모리만 사용
+    embedding_cache_enabled: bool = True
+    embedding_cache_memory_items: int = 20000
+    embedding_cache_path: str = str(Path(tempfile.gettempdir()) / "rag-embedding-cache.sqlite3")
+    embedding_cache_disk_max_bytes: int = 2 * 1024 * 1024 * 1024
+    # 동시 검색 쿼리 임베딩 마이크로 배칭(max_wait_ms가 0이면 끔)
+    query_batch_max_size: int = 32
+    query_batch_max_wait_ms: float = 5.0
+
+    # Ingestion pipeline (stage workers / bounded queue size between stages)
+    ingest_extract_workers: int = 2
+    ingest_chunk_workers: int = 1
+    ingest_embed_workers: int = 1
+    ingest_upsert_workers: int = 2
+    ingest_queue_size: int = 8
+    # 부분 배치를 기다리는 최대 시간(ms), 이후에는 찬 만큼 임베딩
+    ingest_batch_flush_ms: int = 200
+    # 이만큼 문서를 적재할 때마다 매니페스트 저장(중단 후 재실행 시 이어서 처리)
+    ingest_checkpoint_every: int = 16
 
     # PDF service
     pdf_service_url: str = "http://localhost:8010"
+    pdf_batch_size: int = 16
+    pdf_response_format: str = "binary"
+    # remote: PDF 서비스 HTTP 호출(keep-alive 풀 + 재시도) / inprocess: pdf.service.pdf_service를 프로세스 풀로 직접 호출
+    pdf_extraction_mode: str = "remote"
+    pdf_connect_timeout: float = 5.0
+    # 파일당 읽기 타임아웃(배치는 파일 수만큼 곱한다)
+    pdf_read_timeout: float = 60.0
+    pdf_max_retries: int = 3
+    pdf_retry_backoff: float = 0.5
+    pdf_pool_size: int = 8
+    # 0이면 코어 수만큼
+    pdf_inprocess_workers: int = 0
 
     # LLM
     llm_provider: str = "stub"
@@ -47,5 +134,8 @@ class Settings(BaseSettings):
     mariadb_password: str = ""
     mariadb_database: str = ""
 
+    def request_limit_bytes(self) -> int:
+        return self.max_request_bytes or self.upload_max_bytes + self.multipart_overhead_bytes
+
 
 settings = Settings()
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 
 @dataclass(frozen=True)
@@ -20,3 +20,29 @@ class RiskAnalysisResult:
     rationale: str
     generated_at: datetime
     citations: List[Dict[str, str]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class IngestionJob:
+    job_id: str
+    file_name: str
+    sha256: str
+    status: str
+    stage: str
+    progress: float
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    chunk_count: int = 0
+    error: Optional[str] = None
+    # 인입 대상 파일 경로(data_dir 기준 저장 위치)
+    path: str = ""
+
+
+@dataclass(frozen=True)
+class ExtractedPdf:
+    text: str
+    page_count: int
+    # 각 페이지가 text 안에서 시작하는 문자 오프셋
+    page_offsets: List[int] = field(default_factory=list)
+    error: str = ""
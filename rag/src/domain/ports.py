@@ -1,13 +1,43 @@
-from typing import List, Protocol
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Tuple
 
-from domain.models import SearchResult
+from domain.models import ExtractedPdf, SearchResult
 
 
 class VectorStore(Protocol):
-    def search(self, query: str, k: int) -> List[SearchResult]:
+    def search(self, query: str, k: int, filters: Optional[Dict[str, Any]] = None) -> List[SearchResult]:
         ...
 
-    def upsert(self, doc_id: str, chunks: List[str], vectors: List[List[float]], metadata: dict) -> None:
+    def upsert(
+        self,
+        doc_id: str,
+        chunks: List[str],
+        vectors: List[List[float]],
+        metadata: dict,
+        page_ranges: Optional[List[Tuple[int, int]]] = None,
+    ) -> None:
+        ...
+
+    def delete(self, doc_id: str) -> None:
+        ...
+
+
+class Embedder(Protocol):
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        ...
+
+
+class PdfExtractor(Protocol):
+    def extract(self, path: Path) -> ExtractedPdf:
+        ...
+
+    def extract_batch(self, paths: List[Path]) -> List[ExtractedPdf]:
+        ...
+
+    def iter_pages(self, path: Path, start_page: int = 1, end_page: int | None = None) -> Iterator[Tuple[int, str]]:
+        ...
+
+    def close(self) -> None:
         ...
 
 
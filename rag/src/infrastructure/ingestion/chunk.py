@@ -1,8 +1,141 @@
-from typing import List
+import math
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence
 
+from config import settings
+from infrastructure.ingestion.tokenizer import count_tokens
 
-def chunk_text(text: str, max_chars: int = 800) -> List[str]:
-    # 2단계: 파싱/청킹(stub) - 현재는 원문 그대로 1개 청크로 사용
-    _ = max_chars
+# 청킹 규칙이 바뀌면 올려서 기존 인입 결과를 다시 처리하게 한다
+CHUNKER_VERSION = "4"
+
+# 문단(빈 줄) / 줄바꿈 / 문장부호(한국어 종결 포함) 뒤 공백을 경계로 본다.
+# 중국어/일본어 전각 종결부호(。！？)는 띄어쓰기 없이 이어지므로 공백이 없어도 경계
+_BOUNDARY = re.compile(r"\n[ \t]*\n\s*|\n\s*|(?<=[.!?…])[ \t]+|(?<=[。！？])[ \t]*")
+# 윈도가 이 비율 이상 찼으면 문단 경계에서 먼저 끊는다
+_PARAGRAPH_FILL = 0.6
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    text: str
+    page_start: int
+    page_end: int
+    # 청킹 중 센 토큰 수(유닛 합계, 특수 토큰 제외) - 임베딩 배치를 나눌 때 다시 세지 않도록 넘긴다
+    tokens: int = 0
+
+
+@dataclass(frozen=True)
+class _Unit:
+    text: str
+    tokens: int
+    joiner: str
+    paragraph_start: bool
+    page: int
+
+
+def chunk_text(
+    text: str, max_tokens: Optional[int] = None, overlap_tokens: Optional[int] = None
+) -> List[str]:
+    # 2단계: 파싱/청킹
+    return [chunk.text for chunk in iter_chunks([text], max_tokens, overlap_tokens)]
+
+
+def chunk_pages(
+    text: str,
+    page_offsets: Sequence[int] = (),
+    max_tokens: Optional[int] = None,
+    overlap_tokens: Optional[int] = None,
+) -> List[TextChunk]:
+    # 추출 결과(전체 텍스트 + 페이지 시작 오프셋)를 페이지 단위로 나눠 청크마다 페이지 범위를 붙인다
+    return list(iter_chunks(split_pages(text, page_offsets), max_tokens, overlap_tokens))
+
+
+def split_pages(text: str, page_offsets: Sequence[int]) -> Iterator[str]:
+    if not page_offsets:
+        yield text
+        return
+    bounds = list(page_offsets) + [len(text)]
+    for start, end in zip(bounds, bounds[1:]):
+        yield text[start:end]
+
+
+def iter_chunks(
+    pages: Iterable[str], max_tokens: Optional[int] = None, overlap_tokens: Optional[int] = None
+) -> Iterator[TextChunk]:
+    # 페이지 텍스트를 순서대로 받아 토큰 한도 안의 슬라이딩 윈도 청크를 바로바로 내보낸다(문서 전체를 붙이지 않음)
+    limit = max(1, max_tokens or settings.chunk_max_tokens)
+    overlap = settings.chunk_overlap_tokens if overlap_tokens is None else overlap_tokens
+    overlap = max(0, min(overlap, limit // 2))
+    window: List[_Unit] = []
+    window_tokens = 0
+    fresh = 0
+    for unit in _iter_units(pages, limit):
+        full = window_tokens + unit.tokens > limit
+        paragraph_break = unit.paragraph_start and window_tokens >= limit * _PARAGRAPH_FILL
+        if fresh and (full or paragraph_break):
+            yield _to_chunk(window)
+            window = _overlap_tail(window, overlap)
+            window_tokens = sum(item.tokens for item in window)
+            fresh = 0
+            if window_tokens + unit.tokens > limit:
+                window, window_tokens = [], 0
+        window.append(unit)
+        window_tokens += unit.tokens
+        fresh += 1
+    if fresh:
+        yield _to_chunk(window)
+
+
+def _iter_units(pages: Iterable[str], limit: int) -> Iterator[_Unit]:
+    for page_number, page in enumerate(pages, start=1):
+        joiner = "\n"
+        paragraph_start = True
+        position = 0
+        for match in _BOUNDARY.finditer(page):
+            yield from _make_units(page[position : match.start()], joiner, paragraph_start, page_number, limit)
+            separator = match.group()
+            if position != match.start():
+                joiner = "\n" if "\n" in separator else (" " if separator else "")
+                paragraph_start = separator.count("\n") >= 2
+            else:
+                paragraph_start = paragraph_start or separator.count("\n") >= 2
+            position = match.end()
+        yield from _make_units(page[position:], joiner, paragraph_start, page_number, limit)
+
+
+def _make_units(text: str, joiner: str, paragraph_start: bool, page: int, limit: int) -> Iterator[_Unit]:
     stripped = text.strip()
-    return [stripped] if stripped else []
+    if not stripped:
+        return
+    tokens = count_tokens(stripped)
+    if tokens <= limit or len(stripped) <= 1:
+        yield _Unit(stripped, tokens, joiner, paragraph_start, page)
+        return
+    # 한도를 넘는 단일 문장/줄은 공백 근처에서 잘라 다시 센다
+    pieces = math.ceil(tokens / limit)
+    target = max(1, len(stripped) // pieces)
+    cut = stripped.rfind(" ", target // 2, target + 1)
+    cut = cut if cut > 0 else target
+    # 공백 없이 이어진 텍스트(CJK 등)를 임의 위치에서 자르면 다시 붙일 때 공백을 넣지 않는다
+    rest_joiner = " " if stripped[cut - 1].isspace() or stripped[cut].isspace() else ""
+    yield from _make_units(stripped[:cut], joiner, paragraph_start, page, limit)
+    yield from _make_units(stripped[cut:], rest_joiner, False, page, limit)
+
+
+def _overlap_tail(window: List[_Unit], overlap: int) -> List[_Unit]:
+    tail: List[_Unit] = []
+    total = 0
+    for unit in reversed(window):
+        if total + unit.tokens > overlap:
+            break
+        tail.append(unit)
+        total += unit.tokens
+    tail.reverse()
+    return tail
+
+
+def _to_chunk(window: List[_Unit]) -> TextChunk:
+    text = window[0].text + "".join(unit.joiner + unit.text for unit in window[1:])
+    tokens = sum(unit.tokens for unit in window)
+    return TextChunk(text=text, page_start=window[0].page, page_end=window[-1].page, tokens=tokens)
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, List
-
-import requests
+from typing import Iterable, Iterator, List
 
 from config import settings
+from infrastructure.ingestion.extraction_client import get_pdf_extractor
+
+# data_dir/projects/<project_id>/... 아래 문서는 해당 프로젝트 전용, 그 외는 공용 문서
+PROJECTS_DIR = "projects"
 
 
 @dataclass(frozen=True)
@@ -14,44 +16,82 @@ class DocumentPayload:
     doc_id: str
     text: str
     metadata: dict
+    # 각 페이지가 text 안에서 시작하는 문자 오프셋(청크 -> 페이지 매핑용)
+    page_offsets: List[int] = field(default_factory=list)
+    # 추출 실패 사유(빈 text가 실패 때문인지, 실제로 텍스트가 없는 문서인지 구분)
+    error: str = ""
 
 
 def load_pdfs_from_dir(data_dir: str) -> List[DocumentPayload]:
-    base = Path(data_dir).resolve()
-    if not base.exists():
-        raise FileNotFoundError(f"Data directory not found: {data_dir}")
-
-    # 1단계: 문서 인입(원문 PDF)
-    pdf_paths = sorted(base.rglob("*.pdf"))
-    return [load_pdf(path, base) for path in pdf_paths]
+    return list(iter_pdfs_from_dir(data_dir))
 
 
 def iter_pdfs_from_dir(data_dir: str) -> Iterable[DocumentPayload]:
     base = Path(data_dir).resolve()
-    if not base.exists():
-        raise FileNotFoundError(f"Data directory not found: {data_dir}")
-    # 1단계: 문서 인입(원문 PDF)
-    for path in sorted(base.rglob("*.pdf")):
-        yield load_pdf(path, base)
+    yield from iter_pdfs(list_pdf_paths(base), base)
+
+
+def list_pdf_paths(base_dir: Path) -> List[Path]:
+    if not base_dir.exists():
+        raise FileNotFoundError(f"Data directory not found: {base_dir}")
+    return sorted(base_dir.rglob("*.pdf"))
+
+
+def iter_pdfs(paths: List[Path], base_dir: Path) -> Iterable[DocumentPayload]:
+    # 1단계: 문서 인입(원문 PDF) - 여러 파일을 한 번의 배치 요청으로 추출
+    batch_size = max(1, settings.pdf_batch_size)
+    for start in range(0, len(paths), batch_size):
+        yield from load_pdfs_batch(paths[start : start + batch_size], base_dir)
+
+
+def relative_doc_id(path: Path, base_dir: Path) -> str:
+    return path.resolve().relative_to(base_dir.resolve()).as_posix()
+
+
+def project_for(rel_path: str) -> str:
+    parts = rel_path.split("/")
+    if len(parts) > 2 and parts[0] == PROJECTS_DIR:
+        return parts[1]
+    return settings.shared_project_id
 
 
 def load_pdf(path: Path, base_dir: Path) -> DocumentPayload:
     print(f"[Loader] open pdf={path}", flush=True)
-    text, page_count = _extract_via_service(path)
-    rel_path = path.resolve().relative_to(base_dir).as_posix()
+    extracted = get_pdf_extractor().extract(path)
+    return _to_payload(path, base_dir, extracted.text, extracted.page_count, extracted.page_offsets, extracted.error)
+
+
+def load_pdfs_batch(paths: List[Path], base_dir: Path) -> List[DocumentPayload]:
+    if not paths:
+        return []
+    print(f"[Loader] open batch size={len(paths)} first={paths[0]}", flush=True)
+    payloads: List[DocumentPayload] = []
+    for path, extracted in zip(paths, get_pdf_extractor().extract_batch(paths)):
+        if extracted.error:
+            # 파일 단위 실패는 빈 텍스트로 넘겨 인입 단계에서 건너뛰게 한다
+            print(f"[Loader] extract failed pdf={path} error={extracted.error}", flush=True)
+        payloads.append(
+            _to_payload(path, base_dir, extracted.text, extracted.page_count, extracted.page_offsets, extracted.error)
+        )
+    return payloads
+
+
+def _to_payload(
+    path: Path, base_dir: Path, text: str, page_count: int, page_offsets: List[int], error: str | None = None
+) -> DocumentPayload:
+    rel_path = relative_doc_id(path, base_dir)
     metadata = {
         "source_path": rel_path,
         "file_name": path.name,
         "page_count": page_count,
+        "project_id": project_for(rel_path),
+        "doc_type": "pdf",
     }
-    return DocumentPayload(doc_id=rel_path, text=text, metadata=metadata)
+    return DocumentPayload(
+        doc_id=rel_path, text=text, metadata=metadata, page_offsets=page_offsets, error=error or ""
+    )
 
 
-def _extract_via_service(path: Path) -> tuple[str, int]:
-    url = f"{settings.pdf_service_url.rstrip('/')}/pdf/extract"
-    with path.open("rb") as fp:
-        files = {"file": (path.name, fp, "application/pdf")}
-        response = requests.post(url, files=files, timeout=60)
-    response.raise_for_status()
-    payload = response.json()
-    return payload.get("text", ""), int(payload.get("page_count", 0))
+def iter_pdf_pages(path: Path, start_page: int = 1, end_page: int | None = None) -> Iterator[tuple[int, str]]:
+    # (페이지 번호, 텍스트)를 추출되는 순서대로 내보낸다
+    yield from get_pdf_extractor().iter_pages(path, start_page, end_page)
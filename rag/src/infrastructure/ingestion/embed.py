@@ -1,32 +1,170 @@
 import logging
-from typing import List
-
-from langchain_community.embeddings import HuggingFaceBgeEmbeddings
+import threading
+from typing import Dict, List, Optional, Sequence
 
 from config import settings
+from domain.ports import Embedder
+from infrastructure.ingestion.embed_batcher import EmbeddingBatcher
+from infrastructure.ingestion.embedding_cache import EmbeddingCache, embedding_key
 
 logger = logging.getLogger(__name__)
 
-_embedder: HuggingFaceBgeEmbeddings | None = None
+EMBEDDING_BACKENDS = ("huggingface", "onnx")
 
+_embedder: Embedder | None = None
+_embedder_lock = threading.Lock()
+_cache: EmbeddingCache | None = None
+_cache_lock = threading.Lock()
+_query_batcher: EmbeddingBatcher | None = None
+_query_batcher_lock = threading.Lock()
 
-def _get_embedder() -> HuggingFaceBgeEmbeddings:
-    global _embedder
-    if _embedder is None:
-        _embedder = HuggingFaceBgeEmbeddings(
+
+def create_embedder(backend: str) -> Embedder:
+    if backend == "huggingface":
+        from langchain_community.embeddings import HuggingFaceBgeEmbeddings
+
+        return HuggingFaceBgeEmbeddings(
             model_name=settings.embedding_model,
             encode_kwargs={"normalize_embeddings": settings.embedding_normalize},
         )
-        logger.info("Embedding model loaded: %s", settings.embedding_model)
+    if backend == "onnx":
+        from infrastructure.ingestion.onnx_embedder import OnnxBgeEmbedder
+
+        return OnnxBgeEmbedder(
+            settings.embedding_onnx_dir,
+            quantized=settings.embedding_onnx_quantized,
+            normalize=settings.embedding_normalize,
+            max_length=settings.embedding_max_length,
+            batch_size=settings.embedding_batch_size,
+            threads=settings.embedding_threads,
+        )
+    raise ValueError(f"Unsupported embedding backend: {backend} (expected one of {', '.join(EMBEDDING_BACKENDS)})")
+
+
+def embedding_model_id() -> str:
+    # 캐시 키용 모델 식별자 - 백엔드/양자화가 다르면 벡터도 조금씩 다르므로 구분
+    if settings.embedding_backend == "onnx":
+        return f"{settings.embedding_model}@onnx{'-int8' if settings.embedding_onnx_quantized else ''}"
+    return settings.embedding_model
+
+
+def _get_embedder() -> Embedder:
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                _embedder = create_embedder(settings.embedding_backend)
+                logger.info("Embedding model loaded: %s", embedding_model_id())
     return _embedder
 
 
-def embed_text(texts: List[str]) -> List[List[float]]:
-    # 3단계: 임베딩(BGE)
+def get_embedding_cache() -> EmbeddingCache | None:
+    global _cache
+    if not settings.embedding_cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache(
+                    memory_max_items=settings.embedding_cache_memory_items,
+                    disk_path=settings.embedding_cache_path,
+                    disk_max_bytes=settings.embedding_cache_disk_max_bytes,
+                )
+    return _cache
+
+
+def get_query_batcher() -> EmbeddingBatcher | None:
+    global _query_batcher
+    if settings.query_batch_max_wait_ms <= 0:
+        return None
+    if _query_batcher is None:
+        with _query_batcher_lock:
+            if _query_batcher is None:
+                _query_batcher = EmbeddingBatcher(
+                    embed_text,
+                    max_batch=settings.query_batch_max_size,
+                    max_wait_ms=settings.query_batch_max_wait_ms,
+                )
+    return _query_batcher
+
+
+def embed_query(text: str) -> List[float]:
+    # 4단계: 검색 쿼리 임베딩 - 동시에 들어온 쿼리를 묶어 한 번에 계산(max_wait_ms가 0이면 바로 계산)
+    batcher = get_query_batcher()
+    if batcher is None:
+        return embed_text([text])[0]
+    return batcher.embed(text)
+
+
+def embedding_stats() -> dict:
+    cache = get_embedding_cache()
+    return {
+        "model": embedding_model_id(),
+        "cache": cache.stats() if cache is not None else None,
+        "query_batcher": _query_batcher.stats() if _query_batcher is not None else None,
+    }
+
+
+def embed_text(texts: List[str], token_counts: Optional[Sequence[int]] = None) -> List[List[float]]:
+    # 3단계: 임베딩(BGE) - 캐시에 없는 텍스트만 모델로 계산(같은 배치 안의 중복도 한 번만).
+    # token_counts는 청커가 이미 센 토큰 수로, 주어지면 길이별 배치에 쓴다(여기서 다시 토크나이즈하지 않음)
     if not texts:
         return []
+    cache = get_embedding_cache()
+    if cache is None:
+        return _embed_documents(texts, token_counts)
+    keys = [embedding_key(embedding_model_id(), settings.embedding_normalize, text) for text in texts]
+    vectors = cache.get_many(keys)
+    missing: Dict[str, int] = {}
+    for index, vector in enumerate(vectors):
+        if vector is None:
+            missing.setdefault(keys[index], index)
+    if missing:
+        computed = _embed_documents(
+            [texts[index] for index in missing.values()],
+            [token_counts[index] for index in missing.values()] if token_counts is not None else None,
+        )
+        cache.put_many(list(zip(missing, computed)))
+        by_key = dict(zip(missing, computed))
+        vectors = [vector if vector is not None else by_key[key] for key, vector in zip(keys, vectors)]
+    print(f"[Embedding] cache hits={len(texts) - len(missing)}/{len(texts)}", flush=True)
+    return vectors
+
+
+def plan_batches(lengths: List[int], max_items: int, max_tokens: int) -> List[List[int]]:
+    # 토큰 길이순으로 정렬해 비슷한 길이끼리 묶고, (배치 내 최대 길이 x 개수)가 토큰 예산을 넘지 않게 자른다.
+    # 반환값은 원래 인덱스 목록이므로 호출 측에서 결과를 원래 순서로 되돌린다
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    batches: List[List[int]] = []
+    current: List[int] = []
+    for index in order:
+        longest = max(1, lengths[index])
+        if current and (len(current) >= max_items or longest * (len(current) + 1) > max_tokens):
+            batches.append(current)
+            current = []
+        current.append(index)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _embed_documents(texts: List[str], token_counts: Optional[Sequence[int]] = None) -> List[List[float]]:
     print(f"[Embedding] start batch={len(texts)} chars={sum(len(t) for t in texts)}", flush=True)
     embedder = _get_embedder()
-    vectors = embedder.embed_documents(texts)
-    print(f"[Embedding] done vectors={len(vectors)} dim={len(vectors[0]) if vectors else 0}", flush=True)
+    if token_counts is None:
+        # 토큰 수를 모르면(검색 쿼리 등) 길이를 재느라 토크나이즈를 한 번 더 하지 않고 모델 배치에 맡긴다
+        vectors = embedder.embed_documents(texts)
+        print(f"[Embedding] done vectors={len(vectors)} dim={len(vectors[0]) if vectors else 0} batches=1", flush=True)
+        return vectors
+    # 패딩 낭비를 줄이도록 길이별로 나눠 계산(CLS/SEP 2토큰 포함, 모델 최대 길이에서 잘림)
+    lengths = [min(count + 2, settings.embedding_max_length) for count in token_counts]
+    batches = plan_batches(lengths, max(1, settings.embedding_batch_size), max(1, settings.embedding_batch_tokens))
+    vectors: List[List[float]] = [[] for _ in texts]
+    for batch in batches:
+        for index, vector in zip(batch, embedder.embed_documents([texts[index] for index in batch])):
+            vectors[index] = vector
+    print(
+        f"[Embedding] done vectors={len(vectors)} dim={len(vectors[0]) if vectors else 0} batches={len(batches)}",
+        flush=True,
+    )
     return vectors
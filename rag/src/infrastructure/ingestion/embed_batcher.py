@@ -0,0 +1,95 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[List[str]], List[List[float]]]
+
+
+class EmbeddingBatcher:
+    # 동시에 들어온 단건 임베딩 요청을 max_wait_ms 동안(또는 max_batch개까지) 모아 한 번의 forward로 계산
+    def __init__(self, embed_fn: EmbedFn, *, max_batch: int, max_wait_ms: float) -> None:
+        self._embed_fn = embed_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue: "queue.Queue[Tuple[str, Future, float]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._histogram: Dict[str, int] = {}
+        self._counters: Dict[str, int] = {"requests": 0, "batches": 0, "errors": 0}
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def embed(self, text: str) -> List[float]:
+        future: Future = Future()
+        self._queue.put((text, future, time.perf_counter()))
+        return future.result()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            requests = self._counters["requests"]
+            batches = self._counters["batches"]
+            return {
+                "max_batch": self.max_batch,
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+                **self._counters,
+                "avg_batch_size": round(requests / batches, 2) if batches else 0.0,
+                "queue_wait_ms_avg": round(self._wait_total / requests * 1000, 2) if requests else 0.0,
+                "queue_wait_ms_max": round(self._wait_max * 1000, 2),
+                "batch_size_histogram": dict(sorted(self._histogram.items(), key=lambda item: _bucket_floor(item[0]))),
+            }
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[str, Future, float]]) -> None:
+        started = time.perf_counter()
+        self._record(batch, started)
+        try:
+            vectors = self._embed_fn([text for text, _, _ in batch])
+        except Exception as exc:
+            logger.exception("Batched embedding failed: size=%d", len(batch))
+            with self._lock:
+                self._counters["errors"] += 1
+            for _, future, _ in batch:
+                future.set_exception(exc)
+            return
+        for (_, future, _), vector in zip(batch, vectors):
+            future.set_result(vector)
+
+    def _record(self, batch: List[Tuple[str, Future, float]], started: float) -> None:
+        bucket = _bucket(len(batch))
+        with self._lock:
+            self._counters["requests"] += len(batch)
+            self._counters["batches"] += 1
+            self._histogram[bucket] = self._histogram.get(bucket, 0) + 1
+            for _, _, enqueued in batch:
+                waited = started - enqueued
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+
+def _bucket(size: int) -> str:
+    # 1, 2, 3-4, 5-8, 9-16 ... 2의 거듭제곱 구간
+    if size <= 2:
+        return str(size)
+    upper = 1 << (size - 1).bit_length()
+    return f"{upper // 2 + 1}-{upper}"
+
+
+def _bucket_floor(bucket: str) -> int:
+    return int(bucket.split("-")[0])
@@ -0,0 +1,163 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 디스크 한도를 넘으면 이 비율까지 줄여 매 삽입마다 정리하지 않게 한다
+_EVICT_TARGET = 0.9
+
+
+def embedding_key(model: str, normalize: bool, text: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{model}\0{int(normalize)}\0".encode("utf-8"))
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    # (모델, normalize, 텍스트 해시) -> 벡터 캐시. 메모리 LRU + sqlite 디스크 계층(float32 BLOB)
+    def __init__(self, *, memory_max_items: int, disk_path: str, disk_max_bytes: int) -> None:
+        self.memory_max_items = memory_max_items
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        if disk_path:
+            Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(disk_path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS embeddings_accessed ON embeddings(accessed_at)")
+            (self._disk_bytes,) = self._db.execute(
+                "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+            ).fetchone()
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        results: List[Optional[List[float]]] = [None] * len(keys)
+        missing: List[int] = []
+        with self._lock:
+            for index, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is None:
+                    missing.append(index)
+                    continue
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                results[index] = vector.tolist()
+        found = self._read_disk([keys[index] for index in missing])
+        with self._lock:
+            for index in missing:
+                vector = found.get(keys[index])
+                if vector is None:
+                    self._counters["misses"] += 1
+                    continue
+                self._counters["disk_hits"] += 1
+                self._remember(keys[index], vector)
+                results[index] = vector.tolist()
+        return results
+
+    def put_many(self, items: Sequence[Tuple[str, List[float]]]) -> None:
+        packed = [(key, array("f", vector)) for key, vector in items]
+        with self._lock:
+            for key, vector in packed:
+                self._remember(key, vector)
+        self._write_disk(packed)
+
+    def stats(self) -> Dict[str, int | float]:
+        with self._lock:
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            lookups = hits + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def _remember(self, key: str, vector: array) -> None:
+        if self.memory_max_items <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_max_items:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, keys: List[str]) -> Dict[str, array]:
+        if self._db is None or not keys:
+            return {}
+        found: Dict[str, array] = {}
+        now = time.time()
+        try:
+            with self._lock:
+                # sqlite 바인딩 변수 한도(기본 999)를 넘지 않게 나눠 조회
+                for start in range(0, len(keys), 500):
+                    part = keys[start : start + 500]
+                    placeholders = ",".join("?" * len(part))
+                    rows = self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", part
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = array("f")
+                        vector.frombytes(blob)
+                        found[key] = vector
+                if found:
+                    self._db.executemany(
+                        "UPDATE embeddings SET accessed_at = ? WHERE key = ?", [(now, key) for key in found]
+                    )
+        except sqlite3.Error:
+            logger.exception("Failed to read embedding cache.")
+            return {}
+        return found
+
+    def _write_disk(self, packed: List[Tuple[str, array]]) -> None:
+        if self._db is None or not packed:
+            return
+        now = time.time()
+        rows = [(key, vector.tobytes(), now) for key, vector in packed]
+        with self._lock:
+            try:
+                self._db.execute("BEGIN")
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings(key, vector, accessed_at) VALUES (?, ?, ?)", rows
+                )
+                self._db.execute("COMMIT")
+                # 덮어쓴 키만큼 과대 계산될 수 있으므로 한도를 넘었을 때만 정확히 다시 센다
+                self._disk_bytes += sum(len(blob) for _, blob, _ in rows)
+                if self._disk_bytes > self.disk_max_bytes:
+                    (self._disk_bytes,) = self._db.execute(
+                        "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+                    ).fetchone()
+                if self._disk_bytes > self.disk_max_bytes:
+                    self._evict_disk()
+            except sqlite3.Error:
+                logger.exception("Failed to write embedding cache.")
+                if self._db.in_transaction:
+                    self._db.execute("ROLLBACK")
+
+    def _evict_disk(self) -> None:
+        # 가장 오래 조회되지 않은 항목부터 한도의 90% 아래로 내려갈 때까지 삭제(호출 측에서 lock 보유)
+        target = int(self.disk_max_bytes * _EVICT_TARGET)
+        evicted = 0
+        rows = self._db.execute("SELECT key, LENGTH(vector) FROM embeddings ORDER BY accessed_at").fetchall()
+        doomed: List[Tuple[str]] = []
+        for key, size in rows:
+            if self._disk_bytes <= target:
+                break
+            doomed.append((key,))
+            self._disk_bytes -= size
+            evicted += 1
+        self._db.executemany("DELETE FROM embeddings WHERE key = ?", doomed)
+        self._counters["evictions"] += evicted
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import settings
+from domain.models import ExtractedPdf
+from domain.ports import PdfExtractor
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_MODES = ("remote", "inprocess")
+
+# PDF 서비스의 길이 접두 바이너리 응답 포맷(pdf/service/page_codec.py와 동일 규약).
+# rag는 pdf 패키지 없이도 동작해야 하므로 디코더를 따로 두고 tests/test_page_codec.py로 왕복을 검증한다
+PAGES_MEDIA_TYPE = "application/x-pdf-pages"
+_DOCUMENT_MAGIC = b"PDFP"
+_BATCH_MAGIC = b"PDFB"
+_FORMAT_VERSION = 1
+_U32 = struct.Struct(">I")
+# 재시도 대상: 서비스 포화(429, Retry-After 준수)와 일시적 게이트웨이 오류
+_RETRY_STATUSES = (429, 502, 503, 504)
+_IN_PROCESS_PAGES_PER_TASK = 32
+
+_extractor: PdfExtractor | None = None
+_extractor_lock = threading.Lock()
+
+
+def get_pdf_extractor() -> PdfExtractor:
+    global _extractor
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                _extractor = create_pdf_extractor(settings.pdf_extraction_mode)
+    return _extractor
+
+
+def close_pdf_extractor() -> None:
+    # 앱 종료 시 HTTP 세션/추출 프로세스 풀 정리
+    global _extractor
+    with _extractor_lock:
+        extractor, _extractor = _extractor, None
+    if extractor is not None:
+        extractor.close()
+
+
+def create_pdf_extractor(mode: str) -> PdfExtractor:
+    if mode == "remote":
+        return RemotePdfExtractor(
+            settings.pdf_service_url,
+            connect_timeout=settings.pdf_connect_timeout,
+            read_timeout=settings.pdf_read_timeout,
+            max_retries=settings.pdf_max_retries,
+            retry_backoff=settings.pdf_retry_backoff,
+            pool_size=settings.pdf_pool_size,
+        )
+    if mode == "inprocess":
+        return InProcessPdfExtractor(workers=settings.pdf_inprocess_workers)
+    raise ValueError(f"Unsupported PDF extraction mode: {mode} (expected one of {', '.join(EXTRACTION_MODES)})")
+
+
+class RemotePdfExtractor:
+    # PDF 서비스 HTTP 호출. keep-alive 커넥션 풀을 재사용하고 일시 오류는 백오프 재시도
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        connect_timeout: float,
+        read_timeout: float,
+        max_retries: int,
+        retry_backoff: float,
+        pool_size: int,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=max_retries,
+            backoff_factor=retry_backoff,
+            status_forcelist=_RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self._session = requests.Session()
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def extract(self, path: Path) -> ExtractedPdf:
+        with path.open("rb") as fp:
+            files = {"file": (path.name, fp, "application/pdf")}
+            response = self._session.post(
+                f"{self.base_url}/pdf/extract", files=files, headers=_accept_headers(), timeout=self._timeout()
+            )
+        response.raise_for_status()
+        if _is_pages_response(response):
+            pages, page_count, _, _ = _decode_document(response.content, 0)
+            text, page_offsets = join_pages(pages)
+            return ExtractedPdf(text=text, page_count=page_count, page_offsets=page_offsets)
+        payload = response.json()
+        return ExtractedPdf(
+            text=payload.get("text", ""),
+            page_count=int(payload.get("page_count", 0)),
+            page_offsets=payload.get("page_offsets") or [],
+        )
+
+    def extract_batch(self, paths: List[Path]) -> List[ExtractedPdf]:
+        if not paths:
+            return []
+        with ExitStack() as stack:
+            files = [("files", (path.name, stack.enter_context(path.open("rb")), "application/pdf")) for path in paths]
+            response = self._session.post(
+                f"{self.base_url}/pdf/extract/batch",
+                files=files,
+                headers=_accept_headers(),
+                timeout=self._timeout(len(paths)),
+            )
+        response.raise_for_status()
+        if _is_pages_response(response):
+            results = []
+            for error, pages in _decode_batch(response.content):
+                text, page_offsets = join_pages(pages)
+                results.append(ExtractedPdf(text=text, page_count=len(pages), page_offsets=page_offsets, error=error))
+            return results
+        return [
+            ExtractedPdf(
+                text=item.get("text", ""),
+                page_count=int(item.get("page_count", 0)),
+                page_offsets=item.get("page_offsets") or [],
+                error=item.get("error") or "",
+            )
+            for item in response.json().get("items", [])
+        ]
+
+    def iter_pages(self, path: Path, start_page: int = 1, end_page: int | None = None) -> Iterator[Tuple[int, str]]:
+        # PDF 서비스의 NDJSON 스트림을 받아 (페이지 번호, 텍스트)를 도착 순서대로 내보낸다
+        params = {"start_page": start_page}
+        if end_page is not None:
+            params["end_page"] = end_page
+        with path.open("rb") as fp:
+            files = {"file": (path.name, fp, "application/pdf")}
+            with self._session.post(
+                f"{self.base_url}/pdf/extract/stream", files=files, params=params, timeout=self._timeout(), stream=True
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    item = json.loads(line)
+                    yield int(item.get("page", 0)), item.get("text", "")
+
+    def close(self) -> None:
+        self._session.close()
+
+    def _timeout(self, files: int = 1) -> Tuple[float, float]:
+        # (connect, read) - 배치는 파일 수만큼 읽기 대기 시간을 늘린다
+        return self.connect_timeout, self.read_timeout * max(1, files)
+
+
+class InProcessPdfExtractor:
+    # 같은 호스트에서 pdf.service.pdf_service의 추출 함수를 프로세스 풀로 직접 호출(HTTP/업로드 복사 없음)
+    def __init__(self, *, workers: int) -> None:
+        try:
+            from pdf.service import pdf_service  # noqa: F401
+        except ImportError as exc:
+            raise RuntimeError(
+                "The pdf package is required for in-process extraction. Run from the repository root and retry."
+            ) from exc
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        logger.info("In-process PDF extraction pool started workers=%d", self.workers)
+
+    def extract(self, path: Path) -> ExtractedPdf:
+        return self.extract_batch([path])[0]
+
+    def extract_batch(self, paths: List[Path]) -> List[ExtractedPdf]:
+        futures = [self._executor.submit(_extract_file, str(path)) for path in paths]
+        results = []
+        for path, future in zip(paths, futures):
+            try:
+                pages = future.result()
+            except Exception as exc:
+                # 파일 단위 실패는 원격 배치 응답과 같이 error로 돌려준다
+                logger.warning("In-process extraction failed: %s (%s)", path, exc)
+                results.append(ExtractedPdf(text="", page_count=0, page_offsets=[], error=str(exc)))
+                continue
+            text, page_offsets = join_pages(pages)
+            results.append(ExtractedPdf(text=text, page_count=len(pages), page_offsets=page_offsets))
+        return results
+
+    def iter_pages(self, path: Path, start_page: int = 1, end_page: int | None = None) -> Iterator[Tuple[int, str]]:
+        page_count = self._executor.submit(_count_pages, str(path)).result()
+        start = max(0, start_page - 1)
+        stop = page_count if end_page is None else min(end_page, page_count)
+        futures = [
+            (first, self._executor.submit(_extract_range, str(path), first, min(stop, first + _IN_PROCESS_PAGES_PER_TASK)))
+            for first in range(start, stop, _IN_PROCESS_PAGES_PER_TASK)
+        ]
+        try:
+            for first, future in futures:
+                for offset, text in enumerate(future.result()):
+                    yield first + offset + 1, text
+        finally:
+            for _, future in futures:
+                future.cancel()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_file(path: str) -> List[str]:
+    # 워커 프로세스에서 실행. PDF 서비스의 추출 캐시(디스크 계층 공유)를 그대로 사용
+    from pdf.service import pdf_service
+    from pdf.service.extraction_cache import file_key
+
+    cache = pdf_service.get_extraction_cache()
+    key = file_key(Path(path)) if cache else ""
+    pages = cache.get(key) if cache else None
+    if pages is None:
+        pages = pdf_service.extract_page_range(Path(path), 0)
+        if cache:
+            cache.put(key, pages)
+    return pages
+
+
+def _extract_range(path: str, start: int, end: int) -> List[str]:
+    from pdf.service import pdf_service
+
+    return pdf_service.extract_page_range(Path(path), start, end)
+
+
+def _count_pages(path: str) -> int:
+    from pdf.service import pdf_service
+
+    return pdf_service.count_pages(Path(path))
+
+
+def join_pages(texts: List[str]) -> Tuple[str, List[int]]:
+    # PDF 서비스의 join_pages_with_offsets와 같은 규칙(줄바꿈 연결 후 strip, tests/test_page_codec.py에서 비교)
+    raw = "\n".join(texts)
+    text = raw.strip()
+    leading = len(raw) - len(raw.lstrip())
+    offsets: List[int] = []
+    position = 0
+    for page in texts:
+        offsets.append(min(max(0, position - leading), len(text)))
+        position += len(page) + 1
+    return text, offsets
+
+
+def _accept_headers() -> dict:
+    # gzip/zstd 해제는 requests(urllib3)가 Content-Encoding에 따라 처리
+    if settings.pdf_response_format == "binary":
+        return {"Accept": f"{PAGES_MEDIA_TYPE}, application/json;q=0.5"}
+    return {"Accept": "application/json"}
+
+
+def _is_pages_response(response: requests.Response) -> bool:
+    return response.headers.get("Content-Type", "").startswith(PAGES_MEDIA_TYPE)
+
+
+def _decode_document(buffer: bytes, offset: int) -> Tuple[List[str], int, int, int]:
+    # (pages, page_count, start_page, 다음 오프셋)
+    if buffer[offset : offset + 4] != _DOCUMENT_MAGIC:
+        raise ValueError("Invalid PDF page payload.")
+    _check_version(buffer, offset + 4, "page")
+    offset += 5
+    page_count, start_page, total = struct.unpack_from(">III", buffer, offset)
+    offset += 12
+    pages: List[str] = []
+    for _ in range(total):
+        text, offset = _decode_str(buffer, offset)
+        pages.append(text)
+    return pages, page_count, start_page, offset
+
+
+def _decode_batch(buffer: bytes) -> List[Tuple[str, List[str]]]:
+    # [(error, pages)] - 요청한 파일 순서와 동일
+    if buffer[:4] != _BATCH_MAGIC:
+        raise ValueError("Invalid PDF batch payload.")
+    _check_version(buffer, 4, "batch")
+    (count,) = _U32.unpack_from(buffer, 5)
+    offset = 9
+    items: List[Tuple[str, List[str]]] = []
+    for _ in range(count):
+        _, offset = _decode_str(buffer, offset)
+        error, offset = _decode_str(buffer, offset)
+        pages, _, _, offset = _decode_document(buffer, offset)
+        items.append((error, pages))
+    return items
+
+
+def _check_version(buffer: bytes, offset: int, kind: str) -> None:
+    # 포맷이 바뀐 PDF 서비스와 섞여 배포되면 엉뚱한 길이로 읽지 말고 바로 실패시킨다
+    version = buffer[offset] if offset < len(buffer) else None
+    if version != _FORMAT_VERSION:
+        raise ValueError(f"Unsupported PDF {kind} payload version: {version} (expected {_FORMAT_VERSION}).")
+
+
+def _decode_str(buffer: bytes, offset: int) -> Tuple[str, int]:
+    (length,) = _U32.unpack_from(buffer, offset)
+    offset += 4
+    return buffer[offset : offset + length].decode("utf-8"), offset + length
@@ -1,8 +1,35 @@
-from typing import List
+import threading
+from typing import List, Optional, Tuple
 
-from infrastructure.qdrant_store import QdrantAdapter
+from config import settings
+from domain.ports import VectorStore
+from infrastructure.search_cache import with_search_cache
+from infrastructure.vector_store import create_vector_store
 
+_adapter: VectorStore | None = None
+_adapter_lock = threading.Lock()
 
-def index_embeddings(doc_id: str, chunks: List[str], vectors: List[List[float]], metadata: dict) -> None:
-    adapter = QdrantAdapter()
-    adapter.upsert(doc_id, chunks, vectors, metadata)
+
+def _get_adapter() -> VectorStore:
+    # 호출마다 클라이언트를 새로 만들지 않도록 하나를 재사용
+    global _adapter
+    if _adapter is None:
+        with _adapter_lock:
+            if _adapter is None:
+                # 업서트/삭제가 검색 결과 캐시 버전을 올리도록 캐시 래퍼를 거친다
+                _adapter = with_search_cache(create_vector_store(settings.vector_provider))
+    return _adapter
+
+
+def index_embeddings(
+    doc_id: str,
+    chunks: List[str],
+    vectors: List[List[float]],
+    metadata: dict,
+    page_ranges: Optional[List[Tuple[int, int]]] = None,
+) -> None:
+    _get_adapter().upsert(doc_id, chunks, vectors, metadata, page_ranges)
+
+
+def delete_document(doc_id: str) -> None:
+    _get_adapter().delete(doc_id)
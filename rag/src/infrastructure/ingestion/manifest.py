@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+_manifests: Dict[Path, "IngestionManifest"] = {}
+_manifests_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    size: int
+    mtime_ns: int
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    sha256: str
+    size: int
+    mtime_ns: int
+    chunker_version: str
+    embedding_model: str
+    chunk_count: int
+
+
+def fingerprint(path: Path) -> FileFingerprint:
+    stat = path.stat()
+    return FileFingerprint(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fp:
+        while chunk := fp.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IngestionManifest:
+    # 상대 경로 -> 마지막으로 인입한 파일 상태(해시/크기/mtime/청킹 버전/임베딩 모델)를 JSON 파일로 보관
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, ManifestEntry] = self._load()
+
+    def get(self, rel_path: str) -> Optional[ManifestEntry]:
+        with self._lock:
+            return self._entries.get(rel_path)
+
+    def put(self, rel_path: str, entry: ManifestEntry) -> None:
+        with self._lock:
+            self._entries[rel_path] = entry
+
+    def remove(self, rel_path: str) -> None:
+        with self._lock:
+            self._entries.pop(rel_path, None)
+
+    def paths(self) -> List[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def detect_change(self, rel_path: str, path: Path, *, chunker_version: str, embedding_model: str) -> Optional[str]:
+        # 변경이 없으면 None, 다시 인입해야 하면 현재 내용의 sha256을 돌려준다.
+        # 크기/mtime이 같으면 해시를 건너뛰고, touch만 된 파일(해시 동일)은 mtime만 갱신한다
+        entry = self.get(rel_path)
+        current = fingerprint(path)
+        if entry is None or entry.chunker_version != chunker_version or entry.embedding_model != embedding_model:
+            return file_sha256(path)
+        if entry.size == current.size and entry.mtime_ns == current.mtime_ns:
+            return None
+        sha256 = file_sha256(path)
+        if entry.sha256 != sha256:
+            return sha256
+        self.put(rel_path, replace(entry, size=current.size, mtime_ns=current.mtime_ns))
+        return None
+
+    def save(self) -> None:
+        # 임시 파일에 쓴 뒤 교체해 중간에 죽어도 이전 매니페스트가 남게 한다
+        with self._lock:
+            data = {
+                "version": MANIFEST_VERSION,
+                "files": {rel_path: asdict(entry) for rel_path, entry in sorted(self._entries.items())},
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+            tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+    def _load(self) -> Dict[str, ManifestEntry]:
+        if not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") != MANIFEST_VERSION:
+                logger.warning("Ingestion manifest version mismatch, rebuilding: %s", self.path)
+                return {}
+            return {rel_path: ManifestEntry(**entry) for rel_path, entry in data.get("files", {}).items()}
+        except (OSError, ValueError, TypeError):
+            logger.exception("Failed to read ingestion manifest, rebuilding: %s", self.path)
+            return {}
+
+
+def get_manifest(path: Path) -> IngestionManifest:
+    # 같은 파일을 여러 요청이 각자 읽고 덮어쓰지 않도록 경로별로 하나만 유지
+    resolved = path.resolve()
+    with _manifests_lock:
+        manifest = _manifests.get(resolved)
+        if manifest is None:
+            manifest = IngestionManifest(resolved)
+            _manifests[resolved] = manifest
+        return manifest
@@ -0,0 +1,73 @@
+import logging
+import os
+from pathlib import Path
+from typing import Any, List
+
+logger = logging.getLogger(__name__)
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+
+
+class OnnxBgeEmbedder:
+    # ONNX Runtime(CPU)로 BGE 인코더를 실행하고 CLS 토큰 임베딩을 L2 정규화(sentence-transformers BGE와 같은 풀링)
+    def __init__(
+        self,
+        model_dir: str,
+        *,
+        quantized: bool = False,
+        normalize: bool = True,
+        max_length: int = 8192,
+        batch_size: int = 32,
+        threads: int = 0,
+    ) -> None:
+        try:
+            import numpy as np
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+        except ImportError as exc:
+            raise RuntimeError(
+                "onnxruntime, transformers and numpy are required for the ONNX embedding backend. "
+                "Install them and retry."
+            ) from exc
+        model_path = Path(model_dir) / (ONNX_QUANTIZED_MODEL_FILE if quantized else ONNX_MODEL_FILE)
+        if not model_path.exists():
+            raise RuntimeError(
+                f"ONNX embedding model not found: {model_path}. Export it with `python -m tools.onnx_embedder export`."
+            )
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = threads or os.cpu_count() or 1
+        options.inter_op_num_threads = 1
+        self._np = np
+        self._session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self._tokenizer: Any = AutoTokenizer.from_pretrained(model_dir)
+        self._input_names = {item.name for item in self._session.get_inputs()}
+        self.normalize = normalize
+        self.max_length = max_length
+        self.batch_size = max(1, batch_size)
+        logger.info("ONNX embedding model loaded: %s", model_path)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            vectors.extend(self._embed_batch(texts[start : start + self.batch_size]))
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        np = self._np
+        encoded = self._tokenizer(
+            texts, padding=True, truncation=True, max_length=self.max_length, return_tensors="np"
+        )
+        feeds = {name: np.asarray(value, dtype=np.int64) for name, value in encoded.items() if name in self._input_names}
+        output = self._session.run(None, feeds)[0]
+        # last_hidden_state(batch, seq, dim)면 CLS, 이미 풀링된 (batch, dim) 출력이면 그대로
+        embeddings = output[:, 0] if output.ndim == 3 else output
+        embeddings = embeddings.astype(np.float32)
+        if self.normalize:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.maximum(norms, 1e-12)
+        return embeddings.tolist()
@@ -0,0 +1,46 @@
+import logging
+import re
+import threading
+from typing import Any
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_tokenizer: Any | None = None
+_tokenizer_loaded = False
+_tokenizer_lock = threading.Lock()
+
+_WIDE_CHARS = re.compile(r"[ᄀ-ᇿ぀-ヿ㄰-㆏㐀-鿿가-힣]")
+
+
+def count_tokens(text: str) -> int:
+    # 임베딩 모델 토크나이저 기준 토큰 수(특수 토큰 제외). 토크나이저가 없으면 보수적으로 추정
+    tokenizer = _get_tokenizer()
+    if tokenizer is None:
+        return estimate_tokens(text)
+    return len(tokenizer.encode(text, add_special_tokens=False))
+
+
+def estimate_tokens(text: str) -> int:
+    # 한글/한자/가나는 글자당 1토큰, 그 외는 4글자당 1토큰으로 넉넉하게 잡는다
+    wide = len(_WIDE_CHARS.findall(text))
+    return wide + (len(text) - wide + 3) // 4
+
+
+def _get_tokenizer() -> Any | None:
+    # 로딩이 끝난 뒤에 loaded를 세워, 동시에 들어온 스레드가 로딩 중에 추정치로 빠지지 않게 한다
+    global _tokenizer, _tokenizer_loaded
+    if not _tokenizer_loaded:
+        with _tokenizer_lock:
+            if not _tokenizer_loaded:
+                try:
+                    from transformers import AutoTokenizer
+
+                    _tokenizer = AutoTokenizer.from_pretrained(settings.embedding_model)
+                    logger.info("Tokenizer loaded: %s", settings.embedding_model)
+                except Exception as exc:
+                    logger.warning("Tokenizer unavailable for %s, using estimate: %s", settings.embedding_model, exc)
+                    _tokenizer = None
+                _tokenizer_loaded = True
+    return _tokenizer
@@ -0,0 +1,313 @@
+import json
+import logging
+import sqlite3
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from domain.models import SearchResult
+from infrastructure.ingestion.embed import embed_query
+from infrastructure.qdrant_store import FILTER_FIELDS, chunk_fields, page_payload, scope_payload
+
+logger = logging.getLogger(__name__)
+
+_MIN_CAPACITY = 1024
+
+
+class LocalVectorStore:
+    # NumPy 전수 검색(brute-force) 벡터 저장소. 정규화한 float32 행렬은 memmap 파일({collection}.f32),
+    # payload는 sqlite 사이드카({collection}.sqlite3). 쓰기는 한 프로세스, 다른 프로세스는 세대 번호로 변경을 감지해 다시 읽는다
+    def __init__(self, directory: str, collection: str) -> None:
+        try:
+            import numpy as np
+        except ImportError as exc:
+            raise RuntimeError("numpy is required for the local vector store. Install it and retry.") from exc
+        self._np = np
+        self.collection = collection
+        base = Path(directory)
+        base.mkdir(parents=True, exist_ok=True)
+        self.path = base
+        self._matrix_path = base / f"{collection}.f32"
+        self._db = sqlite3.connect(
+            str(base / f"{collection}.sqlite3"), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS points ("
+            "slot INTEGER PRIMARY KEY, point_id TEXT NOT NULL UNIQUE, doc_id TEXT NOT NULL, "
+            "chunk_index INTEGER NOT NULL, project_id TEXT NOT NULL, doc_type TEXT NOT NULL, "
+            "source_path TEXT NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS points_doc ON points (doc_id, chunk_index)")
+        self._lock = threading.RLock()
+        self._load()
+
+    def search(self, query: str, k: int, filters: Optional[Dict[str, Any]] = None) -> List[SearchResult]:
+        print(f"[LocalVector] search query_chars={len(query)} top_k={k} filters={filters}", flush=True)
+        return self.search_by_vector(embed_query(query), k, filters)
+
+    def search_by_vector(
+        self, vector: List[float], k: int, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        np = self._np
+        with self._lock:
+            self._reload_if_changed()
+            if self._dim is None or k <= 0:
+                return []
+            if len(vector) != self._dim:
+                raise ValueError(f"Vector size {len(vector)} does not match collection {self.collection} (size {self._dim}).")
+            query = self._normalize(np.asarray([vector], dtype=np.float32))[0]
+            mask = self._filter_mask(filters)
+            candidates = np.flatnonzero(mask)
+            if candidates.size == 0:
+                return []
+            if candidates.size == self._size:
+                scores = self._matrix[: self._size] @ query
+            else:
+                scores = self._matrix[candidates] @ query
+            top = min(k, candidates.size)
+            best = np.argpartition(-scores, top - 1)[:top]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            slots = [int(candidates[index]) for index in best]
+            payloads = self._payloads(slots)
+            return [
+                _to_search_result(payloads[slot], float(scores[index])) for slot, index in zip(slots, best)
+            ]
+
+    def upsert(
+        self,
+        doc_id: str,
+        chunks: List[str],
+        vectors: List[List[float]],
+        metadata: dict,
+        page_ranges: Optional[List[Tuple[int, int]]] = None,
+    ) -> None:
+        # vectors는 리스트 또는 (n, dim) ndarray
+        if not chunks or len(vectors) == 0:
+            return
+        if len(chunks) != len(vectors):
+            raise ValueError("Chunks and vectors must be the same length.")
+        if page_ranges is not None and len(page_ranges) != len(chunks):
+            raise ValueError("Chunks and page ranges must be the same length.")
+        np = self._np
+        matrix = np.asarray(vectors, dtype=np.float32)
+        scope = scope_payload(doc_id, metadata)
+        print(f"[LocalVector] upsert doc_id={doc_id} chunks={len(chunks)}", flush=True)
+        with self._lock:
+            self._reload_if_changed()
+            self._ensure_dim(matrix.shape[1])
+            point_ids = [str(uuid.uuid5(uuid.NAMESPACE_URL, f"{doc_id}:{idx}")) for idx in range(len(chunks))]
+            slots = [self._slots.get(point_id) for point_id in point_ids]
+            reused = [slot for slot in slots if slot is not None]
+            previous = np.array(self._matrix[reused]) if reused else None
+            allocated: List[int] = []
+            try:
+                for index, slot in enumerate(slots):
+                    if slot is None:
+                        slots[index] = self._allocate()
+                        allocated.append(slots[index])
+                self._ensure_capacity(max(slots) + 1)
+                # 벡터를 먼저 기록하고 payload 커밋으로 확정(중간에 죽으면 payload 없는 슬롯은 비어 있는 것으로 본다)
+                self._matrix[slots] = self._normalize(matrix)
+                self._matrix.flush()
+                rows = [
+                    (
+                        slot,
+                        point_id,
+                        doc_id,
+                        idx,
+                        scope["project_id"],
+                        scope["doc_type"],
+                        scope["source_path"],
+                        json.dumps(
+                            {
+                                "doc_id": doc_id,
+                                "chunk_index": idx,
+                                "text": chunk,
+                                **scope,
+                                **page_payload(page_ranges, idx),
+                                "metadata": metadata,
+                            },
+                            ensure_ascii=False,
+                        ),
+                    )
+                    for idx, (slot, point_id, chunk) in enumerate(zip(slots, point_ids, chunks))
+                ]
+                self._db.execute("BEGIN IMMEDIATE")
+                try:
+                    self._db.executemany("INSERT OR REPLACE INTO points VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                    # 문서가 줄었으면 새 청크 수 이후의 포인트 삭제(Qdrant 어댑터와 같은 규칙)
+                    stale = self._delete_rows("doc_id = ? AND chunk_index >= ?", (doc_id, len(chunks)))
+                    self._bump_generation()
+                    self._db.execute("COMMIT")
+                except Exception:
+                    self._db.execute("ROLLBACK")
+                    raise
+            except BaseException:
+                # 실패하면 새로 받은 슬롯은 반환하고, 덮어쓴 기존 포인트의 벡터는 되돌린다(payload와 어긋나지 않게)
+                self._free.extend(allocated)
+                if previous is not None and self._matrix is not None:
+                    self._matrix[reused] = previous
+                    self._matrix.flush()
+                raise
+            for slot, point_id in zip(slots, point_ids):
+                self._slots[point_id] = slot
+                self._set_fields(slot, (doc_id, scope["project_id"], scope["doc_type"], scope["source_path"]))
+            self._release(stale)
+
+    def delete(self, doc_id: str) -> None:
+        # 문서의 모든 청크 포인트 삭제(슬롯은 다음 업서트에서 재사용)
+        print(f"[LocalVector] delete doc_id={doc_id}", flush=True)
+        with self._lock:
+            self._reload_if_changed()
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                removed = self._delete_rows("doc_id = ?", (doc_id,))
+                self._bump_generation()
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._release(removed)
+
+    def health(self) -> dict:
+        with self._lock:
+            return {
+                "provider": "local",
+                "collection": self.collection,
+                "path": str(self.path),
+                "dim": self._dim,
+                "points": len(self._slots),
+                "capacity": self._capacity,
+            }
+
+    def _load(self) -> None:
+        np = self._np
+        meta = dict(self._db.execute("SELECT key, value FROM meta").fetchall())
+        self._generation = int(meta.get("generation", 0))
+        self._dim: Optional[int] = int(meta["dim"]) if "dim" in meta else None
+        self._matrix: Any = None
+        self._capacity = 0
+        if self._dim is not None and self._matrix_path.exists():
+            self._capacity = self._matrix_path.stat().st_size // (self._dim * 4)
+            if self._capacity:
+                self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r+", shape=(self._capacity, self._dim))
+        self._alive = np.zeros(self._capacity, dtype=bool)
+        # 필터 필드별 값 -> 정수 코드(슬롯마다 int32 코드 배열로 마스크를 벡터 연산)
+        self._vocab: Dict[str, Dict[str, int]] = {name: {} for name in FILTER_FIELDS}
+        self._codes = {name: np.full(self._capacity, -1, dtype=np.int32) for name in FILTER_FIELDS}
+        self._slots: Dict[str, int] = {}
+        rows = self._db.execute(
+            "SELECT slot, point_id, doc_id, project_id, doc_type, source_path FROM points"
+        ).fetchall()
+        self._size = 0
+        for slot, point_id, *values in rows:
+            if slot >= self._capacity:
+                continue
+            self._slots[point_id] = slot
+            self._set_fields(slot, tuple(values))
+            self._size = max(self._size, slot + 1)
+        self._free = [slot for slot in range(self._size) if not self._alive[slot]]
+        logger.info("Local vector store loaded: %s points=%d dim=%s", self.path, len(self._slots), self._dim)
+
+    def _reload_if_changed(self) -> None:
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        if row is not None and int(row[0]) != self._generation:
+            self._load()
+
+    def _bump_generation(self) -> None:
+        self._generation += 1
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)", (str(self._generation),)
+        )
+
+    def _ensure_dim(self, dim: int) -> None:
+        if self._dim is None:
+            self._dim = dim
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dim', ?)", (str(dim),))
+            return
+        if dim != self._dim:
+            raise ValueError(f"Vector size {dim} does not match collection {self.collection} (size {self._dim}).")
+
+    def _ensure_capacity(self, needed: int) -> None:
+        # 파일을 두 배씩 늘리고 memmap을 다시 연다
+        np = self._np
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, self._capacity * 2, _MIN_CAPACITY)
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        with self._matrix_path.open("ab") as fp:
+            fp.truncate(capacity * self._dim * 4)
+        self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r+", shape=(capacity, self._dim))
+        grow = capacity - self._capacity
+        self._alive = np.concatenate([self._alive, np.zeros(grow, dtype=bool)])
+        for name in FILTER_FIELDS:
+            self._codes[name] = np.concatenate([self._codes[name], np.full(grow, -1, dtype=np.int32)])
+        self._capacity = capacity
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        slot = self._size
+        self._size += 1
+        return slot
+
+    def _set_fields(self, slot: int, values: tuple) -> None:
+        self._alive[slot] = True
+        for name, value in zip(FILTER_FIELDS, values):
+            vocab = self._vocab[name]
+            self._codes[name][slot] = vocab.setdefault(value, len(vocab))
+
+    def _delete_rows(self, where: str, params: tuple) -> List[tuple]:
+        rows = self._db.execute(f"SELECT slot, point_id FROM points WHERE {where}", params).fetchall()
+        if rows:
+            self._db.execute(f"DELETE FROM points WHERE {where}", params)
+        return rows
+
+    def _release(self, rows: List[tuple]) -> None:
+        for slot, point_id in rows:
+            self._slots.pop(point_id, None)
+            self._alive[slot] = False
+            for name in FILTER_FIELDS:
+                self._codes[name][slot] = -1
+            self._free.append(slot)
+
+    def _filter_mask(self, filters: Optional[Dict[str, Any]]) -> Any:
+        # Qdrant build_filter와 같은 규칙: 값 하나는 일치, 리스트는 그중 하나, 필드끼리는 AND
+        np = self._np
+        mask = self._alive[: self._size].copy()
+        for key, value in (filters or {}).items():
+            if key not in FILTER_FIELDS:
+                raise ValueError(f"Unsupported search filter field: {key}")
+            if value is None:
+                continue
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            codes = [self._vocab[key][item] for item in values if item in self._vocab[key]]
+            mask &= np.isin(self._codes[key][: self._size], codes)
+        return mask
+
+    def _normalize(self, matrix: Any) -> Any:
+        np = self._np
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def _payloads(self, slots: List[int]) -> Dict[int, dict]:
+        placeholders = ",".join("?" for _ in slots)
+        rows = self._db.execute(f"SELECT slot, payload FROM points WHERE slot IN ({placeholders})", slots).fetchall()
+        return {slot: json.loads(payload) for slot, payload in rows}
+
+
+def _to_search_result(payload: dict, score: float) -> SearchResult:
+    # QdrantAdapter._to_search_result와 같은 매핑
+    metadata = {**payload.get("metadata", {}), **chunk_fields(payload)}
+    return SearchResult(
+        doc_id=payload.get("doc_id", ""),
+        score=score,
+        text=payload.get("text", ""),
+        metadata=metadata,
+    )
@@ -1,60 +1,257 @@
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import threading
+import time
 import uuid
 import logging
 
 from config import settings
 from domain.models import SearchResult
-from infrastructure.ingestion.embed import embed_text
+from infrastructure.ingestion.embed import embed_query
+from infrastructure.search_cache import get_search_cache
 
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as rest
+from qdrant_client.http.exceptions import UnexpectedResponse
 
 logger = logging.getLogger(__name__)
 
+# payload 필터에 쓰는 필드 인덱스(doc_id 필터 삭제/재인입 정리용)
+PAYLOAD_INDEXES = {
+    "doc_id": rest.PayloadSchemaType.KEYWORD,
+    "chunk_index": rest.PayloadSchemaType.INTEGER,
+    "project_id": rest.PayloadSchemaType.KEYWORD,
+    "doc_type": rest.PayloadSchemaType.KEYWORD,
+    "source_path": rest.PayloadSchemaType.KEYWORD,
+}
+# search 필터로 허용하는 payload 필드
+FILTER_FIELDS = ("doc_id", "project_id", "doc_type", "source_path")
+QUANTIZATION_MODES = ("none", "scalar", "binary")
+
+# 컬렉션이 없다는 결과는 다른 프로세스가 곧 만들 수 있으므로 짧게만 캐시
+_MISSING_COLLECTION_TTL = 5.0
+
+_upsert_executor: ThreadPoolExecutor | None = None
+_upsert_executor_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CollectionMeta:
+    vector_size: Optional[int]
+    config: rest.CollectionConfig
+
+
+# (url, collection) -> (만료 시각, 메타 또는 None=없음). 같은 프로세스의 어댑터끼리 공유
+_collection_cache: Dict[Tuple[str, str], Tuple[float, Optional[CollectionMeta]]] = {}
+_collection_cache_lock = threading.Lock()
+_collection_create_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+
+def _get_upsert_executor() -> ThreadPoolExecutor:
+    global _upsert_executor
+    if _upsert_executor is None:
+        with _upsert_executor_lock:
+            if _upsert_executor is None:
+                _upsert_executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.qdrant_upsert_parallelism), thread_name_prefix="qdrant-upsert"
+                )
+    return _upsert_executor
+
+
+def scope_payload(doc_id: str, metadata: dict) -> Dict[str, str]:
+    # 필터용 최상위 payload 필드(프로젝트 미지정 문서는 모든 프로젝트가 공유하는 문서로 본다)
+    return {
+        "project_id": str(metadata.get("project_id") or settings.shared_project_id),
+        "doc_type": str(metadata.get("doc_type") or "pdf"),
+        "source_path": str(metadata.get("source_path") or doc_id),
+    }
+
+
+def page_payload(page_ranges: Optional[List[Tuple[int, int]]], index: int) -> Dict[str, int]:
+    # 청크가 걸친 페이지 범위(1부터, 추출 범위 기준)
+    if page_ranges is None:
+        return {}
+    page_start, page_end = page_ranges[index]
+    return {"page_start": page_start, "page_end": page_end}
+
+
+def build_filter(filters: Optional[Dict[str, Any]]) -> Optional[rest.Filter]:
+    # {"field": 값} -> MatchValue, {"field": [값, ...]} -> MatchAny (조건끼리는 AND)
+    if not filters:
+        return None
+    conditions = []
+    for key, value in filters.items():
+        if key not in FILTER_FIELDS:
+            raise ValueError(f"Unsupported search filter field: {key}")
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            conditions.append(rest.FieldCondition(key=key, match=rest.MatchAny(any=list(value))))
+        else:
+            conditions.append(rest.FieldCondition(key=key, match=rest.MatchValue(value=value)))
+    return rest.Filter(must=conditions) if conditions else None
+
+
+def is_not_found(exc: Exception) -> bool:
+    return isinstance(exc, UnexpectedResponse) and exc.status_code == 404
+
+
+def vectors_config(vector_size: int) -> rest.VectorParams:
+    return rest.VectorParams(
+        size=vector_size, distance=rest.Distance.COSINE, on_disk=settings.qdrant_vectors_on_disk
+    )
+
+
+def hnsw_config() -> rest.HnswConfigDiff:
+    return rest.HnswConfigDiff(
+        m=settings.qdrant_hnsw_m,
+        ef_construct=settings.qdrant_hnsw_ef_construct,
+        on_disk=settings.qdrant_hnsw_on_disk,
+    )
+
+
+def quantization_config() -> Optional[rest.QuantizationConfig]:
+    mode = settings.qdrant_quantization
+    always_ram = settings.qdrant_quantization_always_ram
+    if mode == "none":
+        return None
+    if mode == "scalar":
+        # float32 -> int8 (메모리 1/4)
+        return rest.ScalarQuantization(
+            scalar=rest.ScalarQuantizationConfig(type=rest.ScalarType.INT8, quantile=0.99, always_ram=always_ram)
+        )
+    if mode == "binary":
+        # 차원당 1비트 (메모리 1/32, 재정렬 필수)
+        return rest.BinaryQuantization(binary=rest.BinaryQuantizationConfig(always_ram=always_ram))
+    raise ValueError(
+        f"Unsupported Qdrant quantization: {mode} (expected one of {', '.join(QUANTIZATION_MODES)})"
+    )
+
+
+def search_params() -> Optional[rest.SearchParams]:
+    quantization = None
+    if settings.qdrant_quantization != "none":
+        quantization = rest.QuantizationSearchParams(
+            rescore=settings.qdrant_search_rescore, oversampling=settings.qdrant_search_oversampling
+        )
+    if not settings.qdrant_search_ef and quantization is None:
+        return None
+    return rest.SearchParams(hnsw_ef=settings.qdrant_search_ef or None, quantization=quantization)
+
 
 class QdrantAdapter:
-    def __init__(self) -> None:
+    def __init__(self, collection: Optional[str] = None) -> None:
+        # collection: 기본 컬렉션(settings.qdrant_collection) 대신 쓸 컬렉션(마이그레이션/벤치마크용)
         self.url = settings.qdrant_url
         self.api_key = settings.qdrant_api_key
-        self.collection = settings.qdrant_collection
+        self.collection = collection or settings.qdrant_collection
         self.client = QdrantClient(url=self.url, api_key=self.api_key or None)
+        self._payload_indexes_ready = False
 
-    def search(self, query: str, k: int) -> List[SearchResult]:
-        if not self._collection_exists():
+    def search(self, query: str, k: int, filters: Optional[Dict[str, Any]] = None) -> List[SearchResult]:
+        if not self.collection_exists():
             logger.warning("Qdrant collection missing: %s", self.collection)
             return []
         # 4단계: 검색(쿼리 -> 벡터 검색)
-        print(f"[Qdrant] search query_chars={len(query)} top_k={k}", flush=True)
-        query_vector = embed_text([query])[0]
-        response = self.client.query_points(
-            collection_name=self.collection,
-            query=query_vector,
-            limit=k,
-            with_payload=True,
-        )
+        print(f"[Qdrant] search query_chars={len(query)} top_k={k} filters={filters}", flush=True)
+        return self.search_by_vector(embed_query(query), k, filters)
+
+    def search_by_vector(
+        self, query_vector: List[float], k: int, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        try:
+            response = self.client.query_points(
+                collection_name=self.collection,
+                query=query_vector,
+                query_filter=build_filter(filters),
+                search_params=search_params(),
+                limit=k,
+                with_payload=True,
+            )
+        except UnexpectedResponse as exc:
+            if not is_not_found(exc):
+                raise
+            # 캐시 이후 컬렉션이 삭제된 경우
+            self._invalidate_collection()
+            logger.warning("Qdrant collection missing: %s", self.collection)
+            return []
         results = response.points
         logger.info("Qdrant search results=%d collection=%s", len(results), self.collection)
         return [self._to_search_result(point) for point in results]
 
-    def upsert(self, doc_id: str, chunks: List[str], vectors: List[List[float]], metadata: dict) -> None:
+    def upsert(
+        self,
+        doc_id: str,
+        chunks: List[str],
+        vectors: List[List[float]],
+        metadata: dict,
+        page_ranges: Optional[List[Tuple[int, int]]] = None,
+    ) -> None:
         if not chunks or not vectors:
             return
         if len(chunks) != len(vectors):
             raise ValueError("Chunks and vectors must be the same length.")
-        self._ensure_collection(len(vectors[0]))
+        if page_ranges is not None and len(page_ranges) != len(chunks):
+            raise ValueError("Chunks and page ranges must be the same length.")
+        vector_size = len(vectors[0])
+        self.ensure_collection(vector_size)
         # 3단계: 임베딩을 벡터 DB에 저장
-        print(f"[Qdrant] upsert doc_id={doc_id} chunks={len(chunks)}", flush=True)
         points = []
         for idx, (chunk, vector) in enumerate(zip(chunks, vectors)):
             payload = {
                 "doc_id": doc_id,
                 "chunk_index": idx,
                 "text": chunk,
+                **scope_payload(doc_id, metadata),
+                **page_payload(page_ranges, idx),
                 "metadata": metadata,
             }
             point_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{doc_id}:{idx}"))
             points.append(rest.PointStruct(id=point_id, vector=vector, payload=payload))
-        self.client.upsert(collection_name=self.collection, points=points)
+        try:
+            self._write_points(doc_id, points)
+        except UnexpectedResponse as exc:
+            if not is_not_found(exc):
+                raise
+            # 캐시 이후 컬렉션이 삭제됐으면 다시 만들고 한 번 재시도
+            self._invalidate_collection()
+            self.ensure_collection(vector_size)
+            self._write_points(doc_id, points)
+
+    def _write_points(self, doc_id: str, points: List[rest.PointStruct]) -> None:
+        batch_size = max(1, settings.qdrant_upsert_batch_size)
+        batches = [points[start : start + batch_size] for start in range(0, len(points), batch_size)]
+        print(f"[Qdrant] upsert doc_id={doc_id} chunks={len(points)} batches={len(batches)}", flush=True)
+        wait = settings.qdrant_upsert_wait
+        if len(batches) == 1:
+            self.client.upsert(collection_name=self.collection, points=batches[0], wait=wait)
+        else:
+            futures = [
+                _get_upsert_executor().submit(self.client.upsert, collection_name=self.collection, points=batch, wait=wait)
+                for batch in batches
+            ]
+            for future in futures:
+                future.result()
+        # 문서가 줄었으면 새 청크 수 이후의 포인트 삭제. wait=True라서 앞선 wait=False 업서트까지 반영된 뒤 반환(일관성 배리어)
+        self._delete_stale_chunks(doc_id, len(points))
+
+    def delete(self, doc_id: str) -> None:
+        # 문서의 모든 청크 포인트 삭제(원본이 바뀌거나 지워졌을 때)
+        if not self.collection_exists():
+            return
+        print(f"[Qdrant] delete doc_id={doc_id}", flush=True)
+        try:
+            self.client.delete(
+                collection_name=self.collection,
+                points_selector=rest.FilterSelector(
+                    filter=rest.Filter(must=[rest.FieldCondition(key="doc_id", match=rest.MatchValue(value=doc_id))])
+                ),
+            )
+        except UnexpectedResponse as exc:
+            if not is_not_found(exc):
+                raise
+            self._invalidate_collection()
 
     def health(self) -> dict:
         collections = self.client.get_collections()
@@ -63,28 +260,160 @@ class QdrantAdapter:
             "collections": [item.name for item in collections.collections],
         }
 
-    def _collection_exists(self) -> bool:
+    def unscoped_docs(self, page_size: int = 1000) -> Dict[str, dict]:
+        # project_id 등 필터용 payload가 없는 point의 doc_id -> 첫 청크의 metadata
+        docs: Dict[str, dict] = {}
+        unscoped = rest.Filter(must=[rest.IsEmptyCondition(is_empty=rest.PayloadField(key="project_id"))])
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection,
+                scroll_filter=unscoped,
+                limit=page_size,
+                offset=offset,
+                with_payload=["doc_id", "metadata"],
+                with_vectors=False,
+            )
+            for point in points:
+                payload = point.payload or {}
+                doc_id = payload.get("doc_id")
+                if doc_id and doc_id not in docs:
+                    docs[doc_id] = payload.get("metadata") or {}
+            if offset is None:
+                return docs
+
+    def backfill_scope(self, docs: Dict[str, dict]) -> None:
+        # doc_id -> metadata(project_id 포함)로 재임베딩 없이 set_payload만 수행
+        for doc_id, metadata in docs.items():
+            scope = scope_payload(doc_id, metadata)
+            self.client.set_payload(
+                collection_name=self.collection,
+                payload=scope,
+                points=rest.Filter(must=[rest.FieldCondition(key="doc_id", match=rest.MatchValue(value=doc_id))]),
+                wait=True,
+            )
+            print(f"[Backfill] doc_id={doc_id} {scope}", flush=True)
+        # 필터 결과가 바뀌므로 검색 결과 캐시 무효화(Redis 계층을 쓰면 다른 프로세스에도 반영)
+        cache = get_search_cache()
+        if cache is not None and docs:
+            cache.bump(self.collection)
+
+    def collection_exists(self) -> bool:
         try:
-            return self.client.collection_exists(self.collection)
+            return self._collection_meta() is not None
         except Exception:
             logger.exception("Failed to check Qdrant collection existence.")
             return False
 
-    def _ensure_collection(self, vector_size: int) -> None:
-        if self._collection_exists():
+    def _collection_meta(self, refresh: bool = False) -> Optional[CollectionMeta]:
+        # 컬렉션 존재 여부/벡터 차원/설정을 TTL 동안 캐시해 검색·업서트마다 조회하지 않는다
+        key = (self.url, self.collection)
+        now = time.monotonic()
+        if not refresh:
+            with _collection_cache_lock:
+                cached = _collection_cache.get(key)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+        try:
+            info = self.client.get_collection(self.collection)
+        except UnexpectedResponse as exc:
+            if not is_not_found(exc):
+                raise
+            meta = None
+        else:
+            vectors = info.config.params.vectors
+            meta = CollectionMeta(
+                vector_size=vectors.size if isinstance(vectors, rest.VectorParams) else None,
+                config=info.config,
+            )
+        ttl = settings.qdrant_collection_cache_ttl if meta is not None else _MISSING_COLLECTION_TTL
+        with _collection_cache_lock:
+            _collection_cache[key] = (now + ttl, meta)
+        return meta
+
+    def _invalidate_collection(self) -> None:
+        with _collection_cache_lock:
+            _collection_cache.pop((self.url, self.collection), None)
+        self._payload_indexes_ready = False
+
+    def ensure_collection(self, vector_size: int) -> None:
+        meta = self._collection_meta()
+        if meta is None:
+            meta = self._create_collection(vector_size)
+        if meta.vector_size is not None and meta.vector_size != vector_size:
+            raise ValueError(
+                f"Vector size {vector_size} does not match collection {self.collection} (size {meta.vector_size})."
+            )
+        self.ensure_payload_indexes()
+
+    def _create_collection(self, vector_size: int) -> CollectionMeta:
+        # 같은 프로세스에서는 잠금으로 한 번만 만들고, 다른 프로세스와의 경합(이미 존재)은 재조회로 흡수
+        key = (self.url, self.collection)
+        with _collection_cache_lock:
+            create_lock = _collection_create_locks.setdefault(key, threading.Lock())
+        with create_lock:
+            meta = self._collection_meta(refresh=True)
+            if meta is not None:
+                return meta
+            try:
+                self.client.create_collection(
+                    collection_name=self.collection,
+                    vectors_config=vectors_config(vector_size),
+                    hnsw_config=hnsw_config(),
+                    quantization_config=quantization_config(),
+                )
+                print(f"[Qdrant] created collection={self.collection} size={vector_size}", flush=True)
+            except Exception:
+                meta = self._collection_meta(refresh=True)
+                if meta is None:
+                    raise
+                logger.info("Qdrant collection created concurrently: %s", self.collection)
+                return meta
+            self._payload_indexes_ready = False
+            meta = self._collection_meta(refresh=True)
+            if meta is None:
+                raise RuntimeError(f"Qdrant collection was not created: {self.collection}")
+            return meta
+
+    def ensure_payload_indexes(self) -> None:
+        # 기존 컬렉션에도 적용되도록 어댑터마다 한 번 생성(이미 있으면 Qdrant가 그대로 둔다)
+        if self._payload_indexes_ready:
             return
-        self.client.create_collection(
+        for field_name, schema in PAYLOAD_INDEXES.items():
+            self.client.create_payload_index(
+                collection_name=self.collection, field_name=field_name, field_schema=schema, wait=True
+            )
+        self._payload_indexes_ready = True
+
+    def _delete_stale_chunks(self, doc_id: str, chunk_count: int) -> None:
+        self.client.delete(
             collection_name=self.collection,
-            vectors_config=rest.VectorParams(size=vector_size, distance=rest.Distance.COSINE),
+            points_selector=rest.FilterSelector(
+                filter=rest.Filter(
+                    must=[
+                        rest.FieldCondition(key="doc_id", match=rest.MatchValue(value=doc_id)),
+                        rest.FieldCondition(key="chunk_index", range=rest.Range(gte=chunk_count)),
+                    ]
+                )
+            ),
+            wait=True,
         )
 
     def _to_search_result(self, point: rest.ScoredPoint) -> SearchResult:
         payload = point.payload or {}
         metadata = payload.get("metadata", {})
-        metadata = {**metadata, "chunk_index": payload.get("chunk_index")}
+        metadata = {**metadata, **chunk_fields(payload)}
         return SearchResult(
             doc_id=payload.get("doc_id", str(point.id)),
             score=point.score or 0.0,
             text=payload.get("text", ""),
             metadata=metadata,
         )
+
+
+def chunk_fields(payload: dict) -> Dict[str, Any]:
+    fields = {"chunk_index": payload.get("chunk_index")}
+    for key in ("page_start", "page_end"):
+        if key in payload:
+            fields[key] = payload[key]
+    return fields
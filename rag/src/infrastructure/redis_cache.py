@@ -1,3 +1,36 @@
+import threading
+from typing import Any, Optional
+
+
 class RedisAdapter:
     def __init__(self, url: str = "") -> None:
         self.url = url
+        self._client: Any = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._get_client().get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._get_client().set(key, value, px=max(1, int(ttl_seconds * 1000)))
+
+    def get_int(self, key: str) -> int:
+        value = self._get_client().get(key)
+        return int(value) if value is not None else 0
+
+    def incr(self, key: str) -> int:
+        return int(self._get_client().incr(key))
+
+    def ping(self) -> bool:
+        return bool(self._get_client().ping())
+
+    def _get_client(self) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    try:
+                        import redis
+                    except ImportError as exc:
+                        raise RuntimeError("redis is required for the Redis cache tier. Install it and retry.") from exc
+                    self._client = redis.Redis.from_url(self.url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        return self._client
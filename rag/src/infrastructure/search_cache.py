@@ -0,0 +1,213 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import settings
+from domain.models import SearchResult
+from domain.ports import VectorStore
+from infrastructure.redis_cache import RedisAdapter
+
+logger = logging.getLogger(__name__)
+
+_search_cache: "SearchResultCache | None" = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional["SearchResultCache"]:
+    global _search_cache
+    if not settings.search_cache_enabled:
+        return None
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = SearchResultCache(
+                    max_items=settings.search_cache_max_items,
+                    ttl_seconds=settings.search_cache_ttl,
+                    redis=RedisAdapter(settings.redis_url) if settings.redis_url else None,
+                    prefix=settings.search_cache_redis_prefix,
+                )
+    return _search_cache
+
+
+def with_search_cache(store: VectorStore) -> VectorStore:
+    cache = get_search_cache()
+    if cache is None:
+        return store
+    return CachedVectorStore(store, cache, namespace=getattr(store, "collection", type(store).__name__))
+
+
+def normalize_query(query: str) -> str:
+    # 유니코드 NFC + 공백 정리(대소문자는 임베딩 결과가 달라질 수 있어 유지)
+    return " ".join(unicodedata.normalize("NFC", query).split())
+
+
+def search_cache_key(namespace: str, version: int, query: str, k: int, filters: Optional[Dict[str, Any]]) -> str:
+    canonical = {
+        key: sorted(value, key=str) if isinstance(value, (list, tuple, set)) else value
+        for key, value in (filters or {}).items()
+        if value is not None
+    }
+    body = json.dumps({"q": normalize_query(query), "k": k, "f": canonical}, ensure_ascii=False, sort_keys=True)
+    return f"{namespace}:{version}:{hashlib.sha256(body.encode('utf-8')).hexdigest()}"
+
+
+class SearchResultCache:
+    # (정규화 쿼리, k, 필터) -> 검색 결과. 메모리 LRU + 선택적 Redis 계층, 둘 다 TTL 적용.
+    # 키에 컬렉션 버전을 넣어 업서트/삭제 시 버전만 올리면 이전 결과는 더 이상 조회되지 않는다
+    def __init__(
+        self, *, max_items: int, ttl_seconds: float, redis: Optional[RedisAdapter] = None, prefix: str = "rag:search"
+    ) -> None:
+        self.max_items = max_items
+        self.ttl = ttl_seconds
+        self.prefix = prefix
+        self._redis = redis
+        self._memory: "OrderedDict[str, Tuple[float, List[SearchResult]]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "redis_errors": 0,
+        }
+
+    def version(self, namespace: str) -> Optional[int]:
+        # Redis를 쓰면 프로세스 간에 공유되는 버전, 조회 실패 시 None(이번 검색은 캐시를 건너뛴다)
+        if self._redis is None:
+            with self._lock:
+                return self._versions.get(namespace, 0)
+        try:
+            return self._redis.get_int(self._version_key(namespace))
+        except Exception:
+            self._redis_failed("version")
+            return None
+
+    def bump(self, namespace: str) -> None:
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+            self._counters["invalidations"] += 1
+            for key in [key for key in self._memory if key.startswith(f"{namespace}:")]:
+                del self._memory[key]
+        if self._redis is not None:
+            try:
+                self._redis.incr(self._version_key(namespace))
+            except Exception:
+                self._redis_failed("bump")
+
+    def get(self, key: str) -> Optional[List[SearchResult]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return list(entry[1])
+            if entry is not None:
+                del self._memory[key]
+        results = self._redis_get(key)
+        with self._lock:
+            if results is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["redis_hits"] += 1
+            self._remember(key, results, now)
+        return list(results)
+
+    def put(self, key: str, results: List[SearchResult]) -> None:
+        with self._lock:
+            self._remember(key, list(results), time.monotonic())
+        if self._redis is not None:
+            payload = json.dumps([asdict(item) for item in results], ensure_ascii=False).encode("utf-8")
+            try:
+                self._redis.set(f"{self.prefix}:{key}", payload, self.ttl)
+            except Exception:
+                self._redis_failed("set")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self._counters["memory_hits"] + self._counters["redis_hits"]
+            lookups = hits + self._counters["misses"]
+            return {
+                "memory_items": len(self._memory),
+                "max_items": self.max_items,
+                "ttl_seconds": self.ttl,
+                "redis": self._redis is not None,
+                **self._counters,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remember(self, key: str, results: List[SearchResult], now: float) -> None:
+        if self.max_items <= 0:
+            return
+        self._memory[key] = (now + self.ttl, results)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _redis_get(self, key: str) -> Optional[List[SearchResult]]:
+        if self._redis is None:
+            return None
+        try:
+            payload = self._redis.get(f"{self.prefix}:{key}")
+        except Exception:
+            self._redis_failed("get")
+            return None
+        if payload is None:
+            return None
+        return [SearchResult(**item) for item in json.loads(payload)]
+
+    def _redis_failed(self, operation: str) -> None:
+        # Redis 장애는 검색 실패로 번지지 않게 메모리 계층만으로 계속 동작
+        logger.warning("Search cache Redis %s failed.", operation, exc_info=True)
+        with self._lock:
+            self._counters["redis_errors"] += 1
+
+    def _version_key(self, namespace: str) -> str:
+        return f"{self.prefix}:version:{namespace}"
+
+
+class CachedVectorStore:
+    # VectorStore 앞단의 검색 결과 캐시. 쓰기(upsert/delete)는 그대로 전달하고 컬렉션 버전을 올린다
+    def __init__(self, inner: VectorStore, cache: SearchResultCache, *, namespace: str) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.namespace = namespace
+
+    def search(self, query: str, k: int, filters: Optional[Dict[str, Any]] = None) -> List[SearchResult]:
+        version = self.cache.version(self.namespace)
+        if version is None:
+            return self.inner.search(query, k, filters=filters)
+        key = search_cache_key(self.namespace, version, query, k, filters)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        results = self.inner.search(query, k, filters=filters)
+        # 검색 중에 업서트로 버전이 올라갔다면 이 결과는 이전 버전 키에만 남아 다시 조회되지 않는다
+        self.cache.put(key, results)
+        return results
+
+    def upsert(
+        self,
+        doc_id: str,
+        chunks: List[str],
+        vectors: List[List[float]],
+        metadata: dict,
+        page_ranges: Optional[List[Tuple[int, int]]] = None,
+    ) -> None:
+        try:
+            self.inner.upsert(doc_id, chunks, vectors, metadata, page_ranges)
+        finally:
+            self.cache.bump(self.namespace)
+
+    def delete(self, doc_id: str) -> None:
+        try:
+            self.inner.delete(doc_id)
+        finally:
+            self.cache.bump(self.namespace)
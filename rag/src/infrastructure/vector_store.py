@@ -0,0 +1,31 @@
+import threading
+from pathlib import Path
+
+from config import settings
+from domain.ports import VectorStore
+from infrastructure.local_vector_store import LocalVectorStore
+from infrastructure.qdrant_store import QdrantAdapter
+
+VECTOR_PROVIDERS = ("qdrant", "local")
+
+_local_store: VectorStore | None = None
+_local_store_lock = threading.Lock()
+
+
+def create_vector_store(provider: str) -> VectorStore:
+    if provider == "qdrant":
+        return QdrantAdapter()
+    if provider == "local":
+        return _get_local_store()
+    raise ValueError(f"Unsupported vector provider: {provider} (expected one of {', '.join(VECTOR_PROVIDERS)})")
+
+
+def _get_local_store() -> VectorStore:
+    # 같은 파일(memmap/sqlite)을 여러 인스턴스가 열지 않도록 프로세스당 하나만 사용
+    global _local_store
+    if _local_store is None:
+        with _local_store_lock:
+            if _local_store is None:
+                directory = settings.local_vector_dir or str(Path(settings.data_dir) / ".vectors")
+                _local_store = LocalVectorStore(directory, settings.qdrant_collection)
+    return _local_store
@@ -1,10 +1,40 @@
+import threading
+
+from application.ingestion_jobs import IngestionJobManager
 from application.ingestion_service import IngestionService
 from application.risk_report_service import RiskReportService
+from config import settings
+
+_job_manager: IngestionJobManager | None = None
+_job_manager_lock = threading.Lock()
 
 
 def get_ingestion_service() -> IngestionService:
     return IngestionService()
 
 
+def get_ingestion_job_manager() -> IngestionJobManager:
+    # 작업 상태를 요청 간에 공유해야 하므로 프로세스에 하나
+    global _job_manager
+    if _job_manager is None:
+        with _job_manager_lock:
+            if _job_manager is None:
+                _job_manager = IngestionJobManager(
+                    get_ingestion_service,
+                    workers=settings.ingest_job_workers,
+                    max_queue=settings.ingest_job_max_queue,
+                    history=settings.ingest_job_history,
+                )
+    return _job_manager
+
+
+def shutdown_ingestion_jobs() -> None:
+    global _job_manager
+    with _job_manager_lock:
+        job_manager, _job_manager = _job_manager, None
+    if job_manager is not None:
+        job_manager.shutdown()
+
+
 def get_risk_report_service() -> RiskReportService:
     return RiskReportService()
@@ -1,20 +1,31 @@
+import hashlib
 import logging
+import re
+import uuid
 from pathlib import Path
+from typing import Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
-from fastapi.params import File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.params import File, Form
 from fastapi_pagination import Page, Params, create_page
 
-from application.ingestion_service import IngestionService
+from application.ingestion_jobs import IngestionJobManager, JobConflictError, JobQueueFullError
 from application.risk_report_service import RiskReportService
 from config import settings
+from infrastructure.ingestion.docs_loader import PROJECTS_DIR
+from infrastructure.ingestion.embed import embedding_stats
 from infrastructure.qdrant_store import QdrantAdapter
+from infrastructure.search_cache import get_search_cache
+from infrastructure.vector_store import create_vector_store
 from interface.api import schemas
-from interface.api.deps import get_ingestion_service, get_risk_report_service
+from interface.api.deps import get_ingestion_job_manager, get_risk_report_service
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+_PROJECT_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
 @router.post("/api/projects/{project_id}/docs/risk_report", response_model=schemas.RiskReportResponse)
 def generate_risk_report(
     project_id: str,
@@ -84,26 +95,96 @@ def get_risk_report(
     )
 
 
-@router.post("/upload/pdf")
+@router.post(
+    "/upload/pdf",
+    response_model=schemas.UploadAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def upload_pdf(
     file: UploadFile = File(...),
-    service: IngestionService = Depends(get_ingestion_service),
-) -> dict:
+    project_id: Optional[str] = Form(None),
+    jobs: IngestionJobManager = Depends(get_ingestion_job_manager),
+) -> schemas.UploadAcceptedResponse:
     if not file.filename:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing filename.")
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only PDF files are allowed.")
     if file.content_type and file.content_type != "application/pdf":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid content type.")
+    if project_id is not None and not _PROJECT_ID_PATTERN.match(project_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid project_id.")
     data_dir = Path(settings.data_dir)
-    data_dir.mkdir(parents=True, exist_ok=True)
+    # 프로젝트 문서는 projects/<project_id>/ 아래에 저장(경로가 검색 필터용 project_id가 된다)
+    target_dir = data_dir / PROJECTS_DIR / project_id if project_id else data_dir
+    target_dir.mkdir(parents=True, exist_ok=True)
     safe_name = Path(file.filename).name
-    target_path = data_dir / safe_name
-    content = await file.read()
-    target_path.write_bytes(content)
-    print(f"[Upload] saved path={target_path}", flush=True)
-    service.ingest_pdf_file(target_path, data_dir)
-    return {"status": "ok", "path": str(target_path)}
+    target_path = target_dir / safe_name
+    staged_path, sha256 = await _stage_upload(file, target_path)
+    # 추출/임베딩/업서트는 백그라운드 작업으로 넘기고 작업 id만 바로 반환.
+    # 작업이 접수되면 임시 파일을 target_path로 옮기고, 거절/중복이면 임시 파일만 지운다
+    try:
+        job, deduplicated = jobs.submit(target_path, data_dir, sha256, staged_path)
+    except JobConflictError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    except JobQueueFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "30"},
+        ) from exc
+    finally:
+        staged_path.unlink(missing_ok=True)
+    print(f"[Upload] accepted path={target_path} job_id={job.job_id} deduplicated={deduplicated}", flush=True)
+    # 다른 경로의 같은 내용으로 중복 처리되면 실제로 인입 중인 파일 경로를 돌려준다
+    return schemas.UploadAcceptedResponse(
+        status=job.status, job_id=job.job_id, path=job.path, deduplicated=deduplicated
+    )
+
+
+@router.get("/upload/jobs/{job_id}", response_model=schemas.IngestionJobResponse)
+def get_upload_job(
+    job_id: str,
+    jobs: IngestionJobManager = Depends(get_ingestion_job_manager),
+) -> schemas.IngestionJobResponse:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingestion job not found.")
+    return schemas.IngestionJobResponse(
+        job_id=job.job_id,
+        file_name=job.file_name,
+        status=job.status,
+        stage=job.stage,
+        progress=job.progress,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        chunk_count=job.chunk_count,
+        error=job.error,
+    )
+
+
+async def _stage_upload(file: UploadFile, target_path: Path) -> Tuple[Path, str]:
+    # 업로드를 요청별 임시 파일에 청크 단위로 기록(해시 동시 계산, 크기 한도 초과 시 중단).
+    # 본문은 Starlette가 이미 받아 둔 상태라 큰 요청은 main의 Content-Length 검사에서 먼저 거절되고, 여기는 2차 검사.
+    # 디스크 쓰기는 스레드풀에서 수행하고, (임시 경로, sha256)을 돌려주며 target_path로의 교체는 작업 접수 시점에 한다
+    digest = hashlib.sha256()
+    size = 0
+    part_path = target_path.with_name(f".{target_path.name}.{uuid.uuid4().hex}.part")
+    try:
+        with part_path.open("wb") as out:
+            while chunk := await file.read(settings.upload_chunk_size):
+                size += len(chunk)
+                if size > settings.upload_max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Upload exceeds {settings.upload_max_bytes} bytes.",
+                    )
+                digest.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    return part_path, digest.hexdigest()
 
 
 @router.get("/health/qdrant")
@@ -114,3 +195,26 @@ def health_qdrant() -> dict:
     except Exception as exc:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Qdrant unavailable") from exc
     return {"status": "ok", **detail}
+
+
+@router.get("/health/vector_store")
+def health_vector_store() -> dict:
+    # 설정된 vector_provider(qdrant/local) 기준 상태
+    try:
+        detail = create_vector_store(settings.vector_provider).health()
+    except Exception as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Vector store unavailable") from exc
+    return {"status": "ok", "provider": settings.vector_provider, **detail}
+
+
+@router.get("/health/embedding")
+def health_embedding() -> dict:
+    # 임베딩 캐시 적중률과 쿼리 마이크로 배칭 배치 크기 분포
+    return {"status": "ok", **embedding_stats()}
+
+
+@router.get("/health/search_cache")
+def health_search_cache() -> dict:
+    # 검색 결과 캐시 적중률(메모리/Redis 계층별)
+    cache = get_search_cache()
+    return {"status": "ok", "enabled": cache is not None, **(cache.stats() if cache is not None else {})}
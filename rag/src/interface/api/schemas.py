@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -44,3 +44,23 @@ class RiskReportDetailResponse(BaseModel):
     rationale: str
     generated_at: datetime
     citations: List[RiskCitation]
+
+
+class IngestionJobResponse(BaseModel):
+    job_id: str
+    file_name: str
+    status: str
+    stage: str
+    progress: float
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    chunk_count: int = 0
+    error: Optional[str] = None
+
+
+class UploadAcceptedResponse(BaseModel):
+    status: str
+    job_id: str
+    path: str
+    deduplicated: bool
@@ -1,11 +1,17 @@
 import logging
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
 from fastapi_pagination import add_pagination
 
+from application.scope_backfill import start_scope_backfill
 from config import settings
+from infrastructure.ingestion.extraction_client import close_pdf_extractor
+from interface.api.deps import shutdown_ingestion_jobs
 from interface.api.routes import router as api_router
 
 _repo_root = Path(__file__).resolve().parents[2]
@@ -13,15 +19,40 @@ if str(_repo_root) not in sys.path:
     sys.path.append(str(_repo_root))
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # 필터용 payload 백필은 백그라운드로 돌려 검색 요청을 막지 않는다
+    start_scope_backfill()
+    yield
+    # 대기 중인 인입 작업을 취소한 뒤 추출기(HTTP 세션/프로세스 풀)를 닫는다
+    shutdown_ingestion_jobs()
+    close_pdf_extractor()
+
+
 def create_app() -> FastAPI:
     if not logging.getLogger().handlers:
         logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
-    app = FastAPI(title=settings.app_name)
+    app = FastAPI(title=settings.app_name, lifespan=lifespan)
+    app.middleware("http")(reject_oversized_requests)
     app.include_router(api_router)
     add_pagination(app)
     return app
 
 
+async def reject_oversized_requests(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    # 본문을 파싱(임시 파일로 버퍼링)하기 전에 Content-Length로 과도한 요청을 먼저 거절
+    limit = settings.request_limit_bytes()
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        return JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={"detail": f"Request exceeds {limit} bytes."},
+        )
+    return await call_next(request)
+
+
 def run() -> None:
     import uvicorn
 
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import argparse
+
+from application.scope_backfill import backfill_unscoped
+from infrastructure.qdrant_store import QdrantAdapter
+
+# 사용법 (rag/src에서 실행)
+#   python -m tools.backfill_payload --dry-run
+#   python -m tools.backfill_payload
+# project_id 등 필터용 payload가 없는 기존 point에 값을 채운다(재임베딩 없이 set_payload만 수행).
+# 앱 시작 시에도 같은 백필을 백그라운드로 수행한다(RAG_QDRANT_BACKFILL_ON_STARTUP)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill filterable payload fields on existing Qdrant points")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="only list documents that need a backfill")
+    args = parser.parse_args()
+    adapter = QdrantAdapter()
+    if not adapter.collection_exists():
+        print(f"[Backfill] collection not found: {adapter.collection}", flush=True)
+        return
+    adapter.ensure_payload_indexes()
+    docs = backfill_unscoped(adapter, args.page_size, dry_run=args.dry_run)
+    projects = sorted({metadata["project_id"] for metadata in docs.values()})
+    print(f"[Backfill] unscoped docs={len(docs)} projects={projects}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
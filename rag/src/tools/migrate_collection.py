@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import argparse
+import json
+
+from qdrant_client.http import models as rest
+
+from config import settings
+from infrastructure.qdrant_store import QdrantAdapter, hnsw_config, quantization_config
+
+# 사용법 (rag/src에서 실행, RAG_QDRANT_HNSW_* / RAG_QDRANT_QUANTIZATION 등 새 설정을 환경변수로 지정)
+#   python -m tools.migrate_collection show
+#   python -m tools.migrate_collection update                      # 기존 컬렉션 설정 변경(서버가 백그라운드로 재색인)
+#   python -m tools.migrate_collection copy --target rag_chunks_v2 # 새 설정의 컬렉션을 만들고 포인트 복사
+
+
+def describe(adapter: QdrantAdapter, collection: str) -> dict:
+    info = adapter.client.get_collection(collection)
+    return {
+        "collection": collection,
+        "status": str(info.status),
+        "points": info.points_count,
+        "vectors": info.config.params.vectors.model_dump(mode="json", exclude_none=True),
+        "hnsw": info.config.hnsw_config.model_dump(mode="json", exclude_none=True),
+        "quantization": info.config.quantization_config.model_dump(mode="json", exclude_none=True)
+        if info.config.quantization_config
+        else None,
+    }
+
+
+def desired() -> dict:
+    quantization = quantization_config()
+    return {
+        "vectors_on_disk": settings.qdrant_vectors_on_disk,
+        "hnsw": hnsw_config().model_dump(mode="json", exclude_none=True),
+        "quantization": quantization.model_dump(mode="json", exclude_none=True) if quantization else None,
+        "search_ef": settings.qdrant_search_ef,
+    }
+
+
+def update(adapter: QdrantAdapter) -> None:
+    # 양자화를 끄려면 Disabled를 명시해야 기존 설정이 지워진다
+    adapter.client.update_collection(
+        collection_name=adapter.collection,
+        vectors_config={"": rest.VectorParamsDiff(on_disk=settings.qdrant_vectors_on_disk)},
+        hnsw_config=hnsw_config(),
+        quantization_config=quantization_config() or rest.Disabled.DISABLED,
+    )
+    print(f"[Migrate] updated collection={adapter.collection}", flush=True)
+
+
+def copy(adapter: QdrantAdapter, target_name: str, batch_size: int) -> int:
+    if adapter.client.collection_exists(target_name):
+        raise RuntimeError(f"Target collection already exists: {target_name}")
+    vector_size = adapter.client.get_collection(adapter.collection).config.params.vectors.size
+    target = QdrantAdapter(collection=target_name)
+    target.ensure_collection(vector_size)
+    copied = 0
+    offset = None
+    while True:
+        points, offset = adapter.client.scroll(
+            collection_name=adapter.collection,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        if points:
+            target.client.upsert(
+                collection_name=target.collection,
+                points=[rest.PointStruct(id=point.id, vector=point.vector, payload=point.payload) for point in points],
+                wait=True,
+            )
+            copied += len(points)
+            print(f"[Migrate] copied={copied}", flush=True)
+        if offset is None:
+            return copied
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply HNSW/quantization/on-disk settings to a Qdrant collection")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("show", help="print the current collection config next to the configured one")
+    commands.add_parser("update", help="update the existing collection in place")
+    copy_parser = commands.add_parser("copy", help="create a new collection with the configured settings and copy points")
+    copy_parser.add_argument("--target", required=True)
+    copy_parser.add_argument("--batch-size", type=int, default=settings.qdrant_upsert_batch_size)
+    args = parser.parse_args()
+    adapter = QdrantAdapter()
+    if not adapter.collection_exists():
+        print(f"[Migrate] collection not found: {adapter.collection}", flush=True)
+        return
+    if args.command == "update":
+        update(adapter)
+    elif args.command == "copy":
+        copied = copy(adapter, args.target, max(1, args.batch_size))
+        print(f"[Migrate] done points={copied}. Set RAG_QDRANT_COLLECTION={args.target} to switch.", flush=True)
+        return
+    report = {"current": describe(adapter, adapter.collection), "configured": desired()}
+    print(json.dumps(report, ensure_ascii=False, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
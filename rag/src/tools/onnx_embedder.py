@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from config import settings
+from infrastructure.ingestion.chunk import chunk_text
+from infrastructure.ingestion.embed import create_embedder
+from infrastructure.ingestion.onnx_embedder import ONNX_MODEL_FILE, ONNX_QUANTIZED_MODEL_FILE
+
+# 사용법 (rag/src에서 실행)
+#   python -m tools.onnx_embedder export --output ./models/bge-m3-onnx --quantize
+#   python -m tools.onnx_embedder parity --onnx-dir ./models/bge-m3-onnx --quantized --min-cosine 0.99
+
+SAMPLES_DIR = Path(__file__).resolve().parents[3] / "tests" / "samples"
+SAMPLE_QUERIES = [
+    "프로젝트 일정 지연 리스크 분석",
+    "리스크 식별 및 평가 절차는 어떻게 되나요?",
+    "What are the CMMI process areas for requirements management?",
+    "주간 보고에서 마일스톤 변경 이력을 확인하는 방법",
+]
+
+
+def export(args: argparse.Namespace) -> None:
+    try:
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+    except ImportError as exc:
+        raise RuntimeError("optimum[onnxruntime] is required to export the model. Install it and retry.") from exc
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    print(f"[ONNX] export model={args.model} output={output}", flush=True)
+    model = ORTModelForFeatureExtraction.from_pretrained(args.model, export=True)
+    model.save_pretrained(output)
+    AutoTokenizer.from_pretrained(args.model).save_pretrained(output)
+    if args.quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        # 가중치만 int8로 바꾸는 동적 양자화(CPU용)
+        print("[ONNX] quantize int8", flush=True)
+        quantize_dynamic(
+            str(output / ONNX_MODEL_FILE),
+            str(output / ONNX_QUANTIZED_MODEL_FILE),
+            weight_type=QuantType.QInt8,
+        )
+    print(f"[ONNX] done files={sorted(item.name for item in output.iterdir())}", flush=True)
+
+
+def parity(args: argparse.Namespace) -> int:
+    import numpy as np
+
+    settings.embedding_onnx_dir = args.onnx_dir
+    settings.embedding_onnx_quantized = args.quantized
+    texts = load_texts(args.texts, args.limit)
+    print(f"[ONNX] parity texts={len(texts)} quantized={args.quantized}", flush=True)
+    # 피크 RSS는 줄어들지 않으므로 가벼운 ONNX 백엔드를 먼저 올려 각각의 피크를 기록
+    report = {"texts": len(texts), "model": settings.embedding_model, "quantized": args.quantized, "backends": {}}
+    outputs = {}
+    for backend in ("onnx", "huggingface"):
+        started = time.perf_counter()
+        embedder = create_embedder(backend)
+        loaded = time.perf_counter()
+        vectors = np.asarray(embedder.embed_documents(texts), dtype=np.float32)
+        finished = time.perf_counter()
+        outputs[backend] = vectors
+        report["backends"][backend] = {
+            "load_seconds": round(loaded - started, 2),
+            "embed_seconds": round(finished - loaded, 2),
+            "texts_per_sec": round(len(texts) / (finished - loaded), 2),
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        }
+        del embedder
+    reference, candidate = outputs["huggingface"], outputs["onnx"]
+    cosine = np.sum(reference * candidate, axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    )
+    report["cosine"] = {
+        "min": round(float(cosine.min()), 6),
+        "mean": round(float(cosine.mean()), 6),
+        "p5": round(float(np.percentile(cosine, 5)), 6),
+    }
+    # 검색 순위가 유지되는지도 확인: 각 쿼리의 최근접 문서가 두 백엔드에서 같은지
+    queries = len(SAMPLE_QUERIES)
+    if len(texts) > queries:
+        top_reference = np.argmax(reference[:queries] @ reference[queries:].T, axis=1)
+        top_candidate = np.argmax(candidate[:queries] @ candidate[queries:].T, axis=1)
+        report["top1_agreement"] = round(float(np.mean(top_reference == top_candidate)), 4)
+    report["passed"] = report["cosine"]["min"] >= args.min_cosine
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0 if report["passed"] else 1
+
+
+def load_texts(texts_file: str, limit: int) -> List[str]:
+    if texts_file:
+        lines = Path(texts_file).read_text(encoding="utf-8").splitlines()
+        return [line for line in lines if line.strip()][:limit]
+    import fitz
+
+    texts = list(SAMPLE_QUERIES)
+    for path in sorted(SAMPLES_DIR.glob("*.pdf")):
+        with fitz.open(path) as doc:
+            text = "\n".join(page.get_text() for page in doc.pages(0, min(doc.page_count, 20)))
+        texts.extend(chunk_text(text)[: max(1, limit // 4)])
+    return texts[:limit]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ONNX embedding backend export / parity check")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="export the BGE model to ONNX")
+    export_parser.add_argument("--model", default=settings.embedding_model)
+    export_parser.add_argument("--output", required=True)
+    export_parser.add_argument("--quantize", action="store_true", help="also write an int8 model_quantized.onnx")
+    parity_parser = commands.add_parser("parity", help="compare ONNX vectors with the huggingface backend")
+    parity_parser.add_argument("--onnx-dir", default=settings.embedding_onnx_dir)
+    parity_parser.add_argument("--quantized", action="store_true")
+    parity_parser.add_argument("--texts", default="", help="one text per line; defaults to chunks of tests/samples")
+    parity_parser.add_argument("--limit", type=int, default=128)
+    parity_parser.add_argument("--min-cosine", type=float, default=0.99)
+    args = parser.parse_args()
+    if args.command == "export":
+        export(args)
+        return
+    sys.exit(parity(args))
+
+
+if __name__ == "__main__":
+    main()
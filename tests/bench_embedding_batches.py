@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "rag" / "src"))
+
+import fitz
+
+from config import settings
+from infrastructure.ingestion.chunk import TextChunk, chunk_pages
+from infrastructure.ingestion.embed import create_embedder, plan_batches
+
+SAMPLES_DIR = Path(__file__).with_name("samples")
+SHORT_TEXTS = [
+    "주간 회의 안건: 일정 검토",
+    "마일스톤 변경 승인",
+    "리스크 등록부 갱신",
+    "요구사항 변경 요청 #42",
+    "Sprint review agenda",
+    "QA 결함 현황 공유",
+    "배포 일정 재조정",
+    "Vendor contract status",
+]
+
+
+def build_corpus(long_count: int, short_count: int, seed: int) -> Tuple[List[str], List[int]]:
+    # 규정 문서 청크(긴 입력)와 회의 안건 제목(짧은 입력)을 섞은 실제 인입 형태의 입력.
+    # 토큰 수는 인입 경로와 같이 청커가 센 값을 그대로 쓴다(배치 계획용 토크나이즈를 따로 하지 않음)
+    chunks: List[TextChunk] = []
+    for path in sorted(SAMPLES_DIR.glob("*.pdf")):
+        with fitz.open(path) as doc:
+            text = "\n".join(page.get_text() for page in doc.pages(0, min(doc.page_count, 40)))
+        chunks.extend(chunk_pages(text))
+    rng = random.Random(seed)
+    pieces = rng.sample(chunks, min(long_count, len(chunks)))
+    for index in range(short_count):
+        pieces.extend(chunk_pages(rng.choice(SHORT_TEXTS) + f" ({index})"))
+    rng.shuffle(pieces)
+    texts = [piece.text for piece in pieces]
+    lengths = [min(piece.tokens + 2, settings.embedding_max_length) for piece in pieces]
+    return texts, lengths
+
+
+def fixed_batches(count: int, batch_size: int) -> List[List[int]]:
+    # 기존 방식: 도착 순서대로 개수 기준 배치(embed_documents에 통째로 넘겼을 때 모델 배치와 같음)
+    return [list(range(start, min(start + batch_size, count))) for start in range(0, count, batch_size)]
+
+
+def padding_report(batches: List[List[int]], lengths: List[int]) -> Dict[str, Any]:
+    real = sum(lengths)
+    padded = sum(max(lengths[index] for index in batch) * len(batch) for batch in batches)
+    return {
+        "batches": len(batches),
+        "max_batch_items": max(len(batch) for batch in batches),
+        "real_tokens": real,
+        "padded_tokens": padded,
+        "padding_waste_pct": round((padded - real) / padded * 100, 2) if padded else 0.0,
+    }
+
+
+def run_embedder(embedder: Any, texts: List[str], batches: List[List[int]], repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for batch in batches:
+            embedder.embed_documents([texts[index] for index in batch])
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {"best_seconds": round(best, 3), "texts_per_sec": round(len(texts) / best, 2)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Embedding batch planning benchmark (fixed count vs length buckets)")
+    parser.add_argument("--long", type=int, default=256, help="number of regulation chunks")
+    parser.add_argument("--short", type=int, default=256, help="number of short agenda titles")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--batch-size", type=int, default=settings.embedding_batch_size)
+    parser.add_argument("--batch-tokens", type=int, default=settings.embedding_batch_tokens)
+    parser.add_argument("--embed", action="store_true", help="also time the configured embedding backend")
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--output", default="", help="write JSON results to this path")
+    args = parser.parse_args()
+
+    texts, lengths = build_corpus(args.long, args.short, args.seed)
+    plans = {
+        "fixed": fixed_batches(len(texts), args.batch_size),
+        "bucketed": plan_batches(lengths, args.batch_size, args.batch_tokens),
+    }
+    results: Dict[str, Dict[str, Any]] = {name: padding_report(batches, lengths) for name, batches in plans.items()}
+    if args.embed:
+        embedder = create_embedder(settings.embedding_backend)
+        # 모델 로딩/첫 호출 워밍업
+        embedder.embed_documents(texts[:4])
+        for name, batches in plans.items():
+            results[name].update(run_embedder(embedder, texts, batches, args.repeat))
+            print(f"[BENCH] {name} {results[name]['texts_per_sec']} texts/sec", flush=True)
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "backend": settings.embedding_backend if args.embed else None,
+        "model": settings.embedding_model,
+        "texts": len(texts),
+        "batch_size": args.batch_size,
+        "batch_tokens": args.batch_tokens,
+        "results": results,
+    }
+    if args.embed:
+        report["speedup"] = round(results["bucketed"]["texts_per_sec"] / results["fixed"]["texts_per_sec"], 2)
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+        print(f"[BENCH] wrote {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
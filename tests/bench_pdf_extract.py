@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import fitz
+import requests
+
+from pdf.config import settings
+from pdf.service import pdf_service
+from pdf.service.process_stats import pool_memory_mb, process_memory_mb, reset_peak_rss
+
+SAMPLES_DIR = Path(__file__).with_name("samples")
+SYNTHETIC_PARAGRAPH = (
+    "프로젝트 일정 지연 리스크는 주간 보고와 회의록의 변경 이력을 근거로 평가한다. "
+    "Schedule risk is assessed against the milestone baseline and the change log. "
+) * 6
+
+
+def build_synthetic_pdf(page_count: int) -> bytes:
+    doc = fitz.open()
+    try:
+        for index in range(page_count):
+            page = doc.new_page()
+            page.insert_textbox(
+                fitz.Rect(36, 36, 559, 806),
+                f"Page {index + 1}\n{SYNTHETIC_PARAGRAPH}",
+                fontname="korea",
+                fontsize=9,
+            )
+        return doc.tobytes()
+    finally:
+        doc.close()
+
+
+def load_corpus(synthetic_pages: List[int]) -> List[Dict[str, Any]]:
+    corpus = []
+    for path in sorted(SAMPLES_DIR.glob("*.pdf")):
+        content = path.read_bytes()
+        corpus.append({"name": path.name, "content": content, "pages": pdf_service.count_pages(content)})
+    for pages in synthetic_pages:
+        content = build_synthetic_pdf(pages)
+        corpus.append({"name": f"synthetic_{pages}p.pdf", "content": content, "pages": pages})
+    return corpus
+
+
+def summarize(latencies: List[float], pages: int, size_bytes: int) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    return {
+        "runs": len(ordered),
+        "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+        "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 2),
+        "pages_per_sec": round(pages * len(ordered) / total, 2) if total else 0.0,
+        "mb_per_sec": round(size_bytes * len(ordered) / total / 1024**2, 2) if total else 0.0,
+    }
+
+
+def bench_in_process(corpus: List[Dict[str, Any]], repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    for item in corpus:
+        content = item["content"]
+        modes: Dict[str, Callable[[], Any]] = {
+            "sync": lambda: pdf_service.extract_pdf_text_from_bytes(content),
+            "async_pool": lambda: asyncio.run(pdf_service.extract_pdf_text_async(content)),
+        }
+        for mode, run in modes.items():
+            reset_peak_memory()
+            latencies = [_timed(run) for _ in range(repeat)]
+            results.append(
+                {
+                    "target": "in_process",
+                    "mode": mode,
+                    "file": item["name"],
+                    "pages": item["pages"],
+                    "bytes": len(content),
+                    **summarize(latencies, item["pages"], len(content)),
+                    "memory": peak_memory(include_pool=mode == "async_pool"),
+                }
+            )
+            print(f"[BENCH] in_process mode={mode} file={item['name']} {results[-1]['p50_ms']}ms", flush=True)
+    return results
+
+
+def bench_http(
+    corpus: List[Dict[str, Any]], url: str, concurrency_levels: List[int], repeat: int
+) -> List[Dict[str, Any]]:
+    endpoint = f"{url.rstrip('/')}/pdf/extract"
+    results = []
+    with requests.Session() as session:
+        for item in corpus:
+            for concurrency in concurrency_levels:
+                requests_total = repeat * concurrency
+
+                def post(_: int) -> tuple[float, int]:
+                    started = time.perf_counter()
+                    files = {"file": (item["name"], item["content"], "application/pdf")}
+                    response = session.post(endpoint, files=files, timeout=300)
+                    return time.perf_counter() - started, response.status_code
+
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    outcomes = list(pool.map(post, range(requests_total)))
+                wall = time.perf_counter() - started
+                latencies = [elapsed for elapsed, code in outcomes if code == 200]
+                summary = summarize(latencies, item["pages"], len(item["content"])) if latencies else {}
+                results.append(
+                    {
+                        "target": "http",
+                        "mode": f"concurrency_{concurrency}",
+                        "file": item["name"],
+                        "pages": item["pages"],
+                        "bytes": len(item["content"]),
+                        "concurrency": concurrency,
+                        "errors": sum(1 for _, code in outcomes if code != 200),
+                        "throughput_pages_per_sec": round(item["pages"] * len(latencies) / wall, 2),
+                        **summary,
+                    }
+                )
+                print(
+                    f"[BENCH] http concurrency={concurrency} file={item['name']} "
+                    f"errors={results[-1]['errors']} {summary.get('p50_ms')}ms",
+                    flush=True,
+                )
+    return results
+
+
+def reset_peak_memory() -> None:
+    # 모드/파일별 최대치를 따로 재도록 벤치 프로세스와 살아 있는 풀 워커의 VmHWM을 초기화
+    # (측정 중 새로 뜬 워커는 시작부터 집계된다)
+    reset_peak_rss()
+    for pid in pdf_service.extraction_pool_pids():
+        reset_peak_rss(pid)
+
+
+def peak_memory(include_pool: bool) -> Dict[str, Any]:
+    # RUSAGE_CHILDREN은 wait된 자식만 집계하므로 살아 있는 워커는 PID별 /proc 값을 합산
+    pool = pool_memory_mb(pdf_service.extraction_pool_pids()) if include_pool else None
+    return {"self": process_memory_mb(), "pool": pool}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="PDF extraction throughput benchmark")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--synthetic-pages", type=int, nargs="*", default=[200, 1000])
+    parser.add_argument(
+        "--url",
+        default="",
+        help="PDF service base URL (start it with PDF_CACHE_ENABLED=false); empty skips HTTP",
+    )
+    parser.add_argument("--concurrency", type=int, nargs="*", default=[1, 4, 8])
+    parser.add_argument("--output", default="", help="write JSON results to this path")
+    args = parser.parse_args()
+
+    # 캐시가 켜져 있으면 반복 측정이 캐시 히트만 재게 되므로 비활성화
+    settings.cache_enabled = False
+    settings.cache_dir = tempfile.mkdtemp(prefix="pdf-bench-")
+    corpus = load_corpus(args.synthetic_pages)
+    results = bench_in_process(corpus, args.repeat)
+    pdf_service.shutdown_extraction_pool()
+    server_stats: Dict[str, Any] = {}
+    if args.url:
+        results.extend(bench_http(corpus, args.url, args.concurrency, args.repeat))
+        # 서버 측 peak RSS와 캐시 히트 여부(캐시가 켜져 있으면 HTTP 수치는 캐시 성능이 된다)
+        server_stats = requests.get(f"{args.url.rstrip('/')}/pdf/stats", timeout=10).json()
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pymupdf": fitz.VersionBind,
+        "machine": platform.machine(),
+        "extract_workers": pdf_service._extract_workers(),
+        "server_stats": server_stats,
+        "results": results,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+        print(f"[BENCH] wrote {args.output}")
+    else:
+        print(output)
+
+
+def _timed(run: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+if __name__ == "__main__":
+    main()
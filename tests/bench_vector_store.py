@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "rag" / "src"))
+
+import numpy as np
+
+from config import settings
+from infrastructure.local_vector_store import LocalVectorStore
+from infrastructure.qdrant_store import QdrantAdapter
+
+# 사용법
+#   python tests/bench_vector_store.py --sizes 10000,100000 --dim 1024
+#   python tests/bench_vector_store.py --sizes 10000,100000,1000000 --qdrant   # RAG_QDRANT_URL의 Qdrant와 비교
+
+
+def iter_docs(size: int, dim: int, chunks_per_doc: int, projects: int, seed: int):
+    # (doc_id, chunks, vectors, metadata) - 문서 단위로 만들어 메모리에 전체 행렬을 올리지 않는다
+    rng = np.random.default_rng(seed)
+    for start in range(0, size, chunks_per_doc):
+        count = min(chunks_per_doc, size - start)
+        doc_index = start // chunks_per_doc
+        project = f"p{doc_index % projects}"
+        doc_id = f"projects/{project}/doc-{doc_index}.pdf"
+        vectors = rng.standard_normal((count, dim), dtype=np.float32)
+        chunks = [f"chunk {start + offset}" for offset in range(count)]
+        yield doc_id, chunks, vectors, {"source_path": doc_id, "project_id": project, "doc_type": "pdf"}
+
+
+def ingest(store: Any, args: argparse.Namespace, size: int, as_list: bool) -> Dict[str, float]:
+    started = time.perf_counter()
+    for doc_id, chunks, vectors, metadata in iter_docs(size, args.dim, args.chunks_per_doc, args.projects, args.seed):
+        store.upsert(doc_id, chunks, vectors.tolist() if as_list else vectors, metadata)
+    elapsed = time.perf_counter() - started
+    return {"ingest_seconds": round(elapsed, 2), "ingest_points_per_sec": round(size / elapsed, 1)}
+
+
+def timed_search(store: Any, queries: np.ndarray, k: int, filters: Optional[dict]) -> Dict[str, Any]:
+    latencies: List[float] = []
+    hits: List[List[str]] = []
+    for query in queries:
+        started = time.perf_counter()
+        results = store.search_by_vector(query.tolist(), k, filters)
+        latencies.append((time.perf_counter() - started) * 1000)
+        hits.append([f"{item.doc_id}:{item.metadata.get('chunk_index')}" for item in results])
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": round(ordered[len(ordered) // 2], 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        "qps": round(len(ordered) / (sum(ordered) / 1000), 1),
+        "hits": hits,
+    }
+
+
+def recall(expected: List[List[str]], actual: List[List[str]]) -> float:
+    # local(전수 검색) 결과를 정답으로 본 recall@k
+    found = sum(len(set(want) & set(got)) for want, got in zip(expected, actual))
+    total = sum(len(want) for want in expected)
+    return round(found / total, 4) if total else 0.0
+
+
+def bench_size(args: argparse.Namespace, size: int, queries: np.ndarray) -> Dict[str, Any]:
+    filters = {"project_id": ["p0", settings.shared_project_id]}
+    report: Dict[str, Any] = {"chunks": size}
+    with tempfile.TemporaryDirectory(dir=args.local_dir or None) as directory:
+        local = LocalVectorStore(directory, f"bench_{size}")
+        report["local"] = ingest(local, args, size, as_list=False)
+        report["local"]["disk_mb"] = round(sum(path.stat().st_size for path in Path(directory).iterdir()) / 2**20, 1)
+        local_all = timed_search(local, queries, args.k, None)
+        local_filtered = timed_search(local, queries, args.k, filters)
+        report["local"]["search"] = {key: value for key, value in local_all.items() if key != "hits"}
+        report["local"]["filtered_search"] = {key: value for key, value in local_filtered.items() if key != "hits"}
+        print(f"[BENCH] local chunks={size} {report['local']}", flush=True)
+    if args.qdrant:
+        adapter = QdrantAdapter(collection=f"bench_{size}")
+        try:
+            report["qdrant"] = ingest(adapter, args, size, as_list=True)
+            qdrant_all = timed_search(adapter, queries, args.k, None)
+            qdrant_filtered = timed_search(adapter, queries, args.k, filters)
+            report["qdrant"]["search"] = {key: value for key, value in qdrant_all.items() if key != "hits"}
+            report["qdrant"]["filtered_search"] = {key: value for key, value in qdrant_filtered.items() if key != "hits"}
+            report["qdrant"]["recall_at_k"] = recall(local_all["hits"], qdrant_all["hits"])
+            report["qdrant"]["filtered_recall_at_k"] = recall(local_filtered["hits"], qdrant_filtered["hits"])
+            print(f"[BENCH] qdrant chunks={size} {report['qdrant']}", flush=True)
+        finally:
+            if not args.keep:
+                adapter.client.delete_collection(adapter.collection)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local NumPy vector store vs Qdrant benchmark")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="comma separated chunk counts")
+    parser.add_argument("--dim", type=int, default=1024, help="BGE-M3 dense vectors are 1024-dim")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=settings.top_k)
+    parser.add_argument("--chunks-per-doc", type=int, default=32)
+    parser.add_argument("--projects", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--local-dir", default="", help="parent directory for the temporary local store")
+    parser.add_argument("--qdrant", action="store_true", help="also benchmark the Qdrant at RAG_QDRANT_URL")
+    parser.add_argument("--keep", action="store_true", help="keep the bench_* Qdrant collections")
+    parser.add_argument("--output", default="", help="write JSON results to this path")
+    args = parser.parse_args()
+
+    queries = np.random.default_rng(args.seed + 1).standard_normal((args.queries, args.dim), dtype=np.float32)
+    sizes = [int(item) for item in args.sizes.split(",") if item.strip()]
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "dim": args.dim,
+        "k": args.k,
+        "queries": args.queries,
+        "qdrant": {
+            "url": settings.qdrant_url,
+            "hnsw_m": settings.qdrant_hnsw_m,
+            "search_ef": settings.qdrant_search_ef,
+            "quantization": settings.qdrant_quantization,
+        }
+        if args.qdrant
+        else None,
+        "results": [bench_size(args, size, queries) for size in sizes],
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+        print(f"[BENCH] wrote {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RAG_SRC = PROJECT_ROOT / "rag" / "src"
+sys.path.insert(0, str(RAG_SRC))
+
+from infrastructure.ingestion import chunk
+from infrastructure.ingestion.chunk import chunk_pages, chunk_text
+from infrastructure.ingestion.tokenizer import count_tokens
+
+KOREAN_SENTENCES = [
+    "프로젝트 일정이 2주 지연되었습니다.",
+    "주요 원인은 외부 업체의 납품 지연입니다!",
+    "대응 방안을 이번 주 회의에서 확정할 예정인가요?",
+    "리스크 등록부를 갱신했습니다.",
+]
+CJK_SENTENCES = ["进度延迟两周。", "原因是供应商交付延迟！", "本周会议将确定对策。"]
+
+
+def check_max_tokens() -> None:
+    text = " ".join(KOREAN_SENTENCES * 40)
+    for limit in (16, 32, 64):
+        chunks = chunk_text(text, max_tokens=limit, overlap_tokens=0)
+        assert len(chunks) > 1, f"expected several chunks for limit={limit}"
+        over = [count_tokens(chunk) for chunk in chunks if count_tokens(chunk) > limit]
+        assert not over, f"chunks over limit={limit}: {over}"
+    # 공백 없는 긴 한 줄도 한도 안으로 잘라야 하고, 다시 붙일 때 공백이 끼어들면 안 된다
+    chunks = chunk_text("가" * 500, max_tokens=50, overlap_tokens=0)
+    assert all(count_tokens(chunk) <= 50 for chunk in chunks), "unbroken line exceeded the limit"
+    assert "".join(chunks) == "가" * 500, "hard cuts inserted whitespace"
+    # 실제 토크나이저에서는 잘린 조각 여러 개가 한 청크에 들어갈 수 있으므로 조각 사이 joiner를 직접 확인
+    units = list(chunk._iter_units(["가" * 500, "word " * 200], 50))
+    assert {unit.joiner for unit in units if unit.text.startswith("가")} == {"\n", ""}, "CJK pieces joined by space"
+    spaced = [unit.joiner for unit in units if unit.text.startswith("word")]
+    assert len(spaced) > 1 and set(spaced[1:]) == {" "}, "spaced pieces lost the space"
+    print(f"[CHUNKER] max tokens ok chunks={len(chunks)}")
+
+
+def check_overlap() -> None:
+    text = " ".join(f"문장 {index}번입니다." for index in range(60))
+    chunks = chunk_text(text, max_tokens=40, overlap_tokens=12)
+    assert len(chunks) > 2, "expected several chunks"
+    for previous, current in zip(chunks, chunks[1:]):
+        last_sentence = previous.split(" 문장 ")[-1].removeprefix("문장 ")
+        assert last_sentence in current, f"missing overlap: {previous[-30:]!r} -> {current[:30]!r}"
+    no_overlap = chunk_text(text, max_tokens=40, overlap_tokens=0)
+    assert sum(map(len, no_overlap)) < sum(map(len, chunks)), "overlap did not repeat any text"
+    print(f"[CHUNKER] overlap ok chunks={len(chunks)}")
+
+
+def check_sentence_boundaries() -> None:
+    # 한국어는 띄어쓰기, 중국어/일본어는 공백 없이 문장이 이어진다
+    for sentences, joiner, label in ((KOREAN_SENTENCES, " ", "korean"), (CJK_SENTENCES, "", "cjk")):
+        text = joiner.join(sentences * 10)
+        limit = max(count_tokens(sentence) for sentence in sentences) * 2
+        chunks = chunk_text(text, max_tokens=limit, overlap_tokens=0)
+        assert len(chunks) > 1, f"{label} text was not split"
+        # 문장 중간에서 끊지 않으므로 모든 청크는 온전한 문장들로만 이뤄진다
+        for chunk in chunks:
+            assert is_whole_sentences(chunk, sentences, joiner), f"{label} chunk breaks a sentence: {chunk!r}"
+        assert joiner.join(chunks) == text, f"{label} chunks do not rebuild the text"
+        print(f"[CHUNKER] {label} sentence boundaries ok chunks={len(chunks)}")
+
+
+def is_whole_sentences(chunk: str, sentences: list[str], joiner: str) -> bool:
+    rest = chunk
+    while rest:
+        sentence = next((item for item in sentences if rest.startswith(item)), None)
+        if sentence is None:
+            return False
+        rest = rest[len(sentence) :].removeprefix(joiner)
+    return True
+
+
+def check_page_ranges() -> None:
+    pages = [" ".join(KOREAN_SENTENCES) for _ in range(3)]
+    text = "\n".join(pages)
+    offsets = []
+    position = 0
+    for page in pages:
+        offsets.append(position)
+        position += len(page) + 1
+    chunks = chunk_pages(text, offsets, max_tokens=20, overlap_tokens=0)
+    assert chunks[0].page_start == 1 and chunks[-1].page_end == 3, "page range does not cover the document"
+    for chunk in chunks:
+        assert 1 <= chunk.page_start <= chunk.page_end <= 3
+    assert [chunk.page_start for chunk in chunks] == sorted(chunk.page_start for chunk in chunks)
+    single = chunk_pages(text, [], max_tokens=20, overlap_tokens=0)
+    assert all(chunk.page_start == chunk.page_end == 1 for chunk in single)
+    print(f"[CHUNKER] page ranges ok chunks={len(chunks)}")
+
+
+def main() -> None:
+    check_max_tokens()
+    check_overlap()
+    check_sentence_boundaries()
+    check_page_ranges()
+    print("[CHUNKER] all checks passed")
+
+
+if __name__ == "__main__":
+    main()
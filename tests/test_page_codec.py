@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import gzip
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RAG_SRC = PROJECT_ROOT / "rag" / "src"
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(RAG_SRC))
+
+from infrastructure.ingestion import extraction_client as client
+from pdf.service import page_codec
+from pdf.service.pdf_service import join_pages_with_offsets
+
+# PDF 서비스 인코더 -> rag 클라이언트 디코더 왕복(두 서비스가 포맷 구현을 따로 갖고 있어 어긋나면 여기서 잡는다)
+PAGE_SETS = [
+    [],
+    [""],
+    ["첫 페이지 본문입니다.", "", "세 번째 페이지 😀 進度延遲。"],
+    ["\n\n  leading blank page", "middle", "trailing  \n\n"],
+    ["   ", "  \n", "only whitespace before"],
+    ["x" * 70000, "끝"],
+]
+
+
+def check_constants() -> None:
+    assert client.PAGES_MEDIA_TYPE == page_codec.PAGES_MEDIA_TYPE
+    assert client._DOCUMENT_MAGIC == page_codec.DOCUMENT_MAGIC
+    assert client._BATCH_MAGIC == page_codec.BATCH_MAGIC
+    assert client._FORMAT_VERSION == page_codec.FORMAT_VERSION
+    print("[PAGE-CODEC] constants ok")
+
+
+def check_document() -> None:
+    for pages in PAGE_SETS:
+        body = page_codec.encode_document(pages, page_count=len(pages) + 3, start_page=2)
+        decoded, page_count, start_page, offset = client._decode_document(body, 0)
+        assert decoded == pages, f"pages mismatch: {pages[:1]!r}"
+        assert (page_count, start_page, offset) == (len(pages) + 3, 2, len(body))
+        # 서비스 쪽 디코더와도 같은 결과
+        assert page_codec.decode_document(body) == (decoded, page_count, start_page, offset)
+    print(f"[PAGE-CODEC] document round trip ok cases={len(PAGE_SETS)}")
+
+
+def check_batch() -> None:
+    items = [(f"doc-{index}.pdf", None, pages) for index, pages in enumerate(PAGE_SETS)]
+    items.insert(1, ("broken.pdf", "Extraction failed.", []))
+    body = page_codec.encode_batch(items)
+    for encoded in (body, gzip.decompress(page_codec.compress(body, "gzip", 0)[0])):
+        decoded = client._decode_batch(encoded)
+        assert decoded == [(error or "", pages) for _, error, pages in items], "batch mismatch"
+    print(f"[PAGE-CODEC] batch round trip ok items={len(items)}")
+
+
+def check_version_mismatch() -> None:
+    # 버전 바이트가 다르면 두 디코더 모두 명확한 오류로 거부한다
+    document = bytearray(page_codec.encode_document(["본문"], page_count=1, start_page=0))
+    document[4] = page_codec.FORMAT_VERSION + 1
+    batch = bytearray(page_codec.encode_batch([("a.pdf", None, ["본문"])]))
+    batch[4] = page_codec.FORMAT_VERSION + 1
+    nested = bytearray(page_codec.encode_batch([("a.pdf", None, ["본문"])]))
+    nested[nested.index(page_codec.DOCUMENT_MAGIC) + 4] = page_codec.FORMAT_VERSION + 1
+    cases = [
+        (lambda: client._decode_document(bytes(document), 0), "page"),
+        (lambda: page_codec.decode_document(bytes(document)), "page"),
+        (lambda: client._decode_batch(bytes(batch)), "batch"),
+        (lambda: client._decode_batch(bytes(nested)), "page"),
+    ]
+    for decode, kind in cases:
+        try:
+            decode()
+        except ValueError as exc:
+            assert "version" in str(exc) and str(page_codec.FORMAT_VERSION + 1) in str(exc), str(exc)
+        else:
+            raise AssertionError(f"{kind} payload with a newer version was accepted")
+    print(f"[PAGE-CODEC] version mismatch rejected cases={len(cases)}")
+
+
+def check_join_pages() -> None:
+    for pages in PAGE_SETS:
+        assert client.join_pages(pages) == join_pages_with_offsets(pages), f"join mismatch: {pages[:1]!r}"
+    print("[PAGE-CODEC] join_pages matches join_pages_with_offsets")
+
+
+def main() -> None:
+    check_constants()
+    check_document()
+    check_batch()
+    check_version_mismatch()
+    check_join_pages()
+    print("[PAGE-CODEC] all checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# moto(로컬 S3 대역)로 실행하므로 실제 AWS 자격 증명은 사용하지 않는다
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+
+import boto3
+from fastapi.testclient import TestClient
+from moto import mock_aws
+
+from pdf.config import settings
+from pdf.main import create_app
+from pdf.service import pdf_service
+
+BUCKET = "alloc-pdf-test"
+
+
+def main() -> None:
+    pdf_path = Path(__file__).with_name("samples") / "Hanwha_risk_management_rules.pdf"
+    if not pdf_path.exists():
+        print(f"[PDF-S3] sample PDF not found: {pdf_path}")
+        return
+    settings.s3_bucket = BUCKET
+    settings.s3_region = "ap-northeast-2"
+    settings.s3_multipart_threshold = 5 * 1024 * 1024
+    settings.s3_multipart_chunk_size = 5 * 1024 * 1024
+    with mock_aws():
+        pdf_service._s3_client = None
+        s3 = boto3.client("s3", region_name=settings.s3_region)
+        s3.create_bucket(
+            Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": settings.s3_region}
+        )
+
+        with TestClient(create_app()) as client, pdf_path.open("rb") as fp:
+            files = {"file": (pdf_path.name, fp, "application/pdf")}
+            res = client.post("/pdf/ingest", files=files)
+        print("[PDF-S3] ingest status:", res.status_code)
+        if res.status_code != 200:
+            raise RuntimeError(f"Ingest failed with status {res.status_code}: {res.text}")
+        body = res.json()
+        head = s3.head_object(Bucket=BUCKET, Key=body["s3_key"])
+        print(f"[PDF-S3] key={body['s3_key']} pages={body['page_count']} size={head['ContentLength']}")
+        if head["ContentType"] != "application/pdf":
+            raise RuntimeError(f"Unexpected content type: {head['ContentType']}")
+
+        # 임계값(5MB)을 넘으면 멀티파트 업로드(ETag 끝에 -<파트 수>)가 되어야 한다
+        large = os.urandom(12 * 1024 * 1024)
+        key = pdf_service.upload_pdf_to_s3("large.pdf", large)
+        etag = s3.head_object(Bucket=BUCKET, Key=key)["ETag"].strip('"')
+        print(f"[PDF-S3] multipart key={key} etag={etag}")
+        if not etag.endswith("-3"):
+            raise RuntimeError(f"Expected a 3-part multipart upload, got ETag {etag}")
+        if s3.get_object(Bucket=BUCKET, Key=key)["Body"].read() != large:
+            raise RuntimeError("Multipart upload content mismatch.")
+        pdf_service._s3_client = None
+    print("[PDF-S3] ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+import time
 from pathlib import Path
 
 import mariadb
@@ -25,6 +26,22 @@ def _load_seed_sql() -> None:
     finally:
         conn.close()
 
+def _wait_for_ingestion(job_id: str, timeout: float = 600.0) -> None:
+    # 업로드는 202로 바로 돌아오므로 인입 작업이 끝날 때까지 상태를 폴링
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job_res = requests.get(f"http://localhost:8000/upload/jobs/{job_id}")
+        job_res.raise_for_status()
+        job = job_res.json()
+        print(f"[TEST] Ingestion job {job_id}: {job['status']} stage={job['stage']} progress={job['progress']}")
+        if job["status"] == "succeeded":
+            return
+        if job["status"] == "failed":
+            raise RuntimeError(f"Ingestion job failed: {job.get('error')}")
+        time.sleep(2)
+    raise RuntimeError(f"Ingestion job {job_id} did not finish within {timeout:.0f}s")
+
+
 _load_seed_sql()
 
 upload_path = Path(__file__).with_name("samples") / "software_development_process_guide.pdf"
@@ -34,9 +51,10 @@ if upload_path.exists():
         upload_res = requests.post("http://localhost:8000/upload/pdf", files=files)
         print("testing PDF upload....")
         print("[TEST] Upload status:", upload_res.status_code)
-        if upload_res.status_code != 200:
+        if upload_res.status_code != 202:
             print(upload_res.text)
             raise RuntimeError(f"Upload failed with status {upload_res.status_code}")
+        _wait_for_ingestion(upload_res.json()["job_id"])
 else:
     print("[TEST] Upload skipped: sample PDF not found:", upload_path)
 